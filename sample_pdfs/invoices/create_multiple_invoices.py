@@ -1,8 +1,17 @@
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import letter
+from reportlab.platypus import Table, TableStyle
 import os
+import argparse
+import sys
 import random
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from sample_utils import sample_dates, draw_block, PAGE_COMPRESSION
 
 # List of company names to use for invoices
 COMPANIES = [
@@ -27,28 +36,71 @@ SERVICES = [
     "Marketing Services"
 ]
 
-def generate_invoice_number():
+# Address lines for each company and its customer, formatted once at import
+COMPANY_ADDRESSES = tuple(
+    (f"{123 + i} Business Avenue",
+     f"Cityville, State {10000 + i * 1000}",
+     f"Phone: (555) {100 + i}-{4000 + i}")
+    for i in range(len(COMPANIES))
+)
+
+CUSTOMER_ADDRESSES = tuple(
+    (f"Customer {i + 1} Ltd.",
+     f"Attn: Customer Contact {i + 1}",
+     f"{400 + i * 10} Client Street",
+     f"Customertown, State {54000 + i * 100}")
+    for i in range(len(COMPANIES))
+)
+
+def generate_invoice_number(rng: random.Random) -> str:
     """Generate a random invoice number"""
     year = datetime.now().year
-    return f"INV-{year}-{random.randint(1000, 9999)}"
+    return f"INV-{year}-{rng.randint(1000, 9999)}"
+
+def sample_invoice_values(n: int, rng: Optional[np.random.Generator] = None) -> List[Dict[str, Any]]:
+    """Draw the random line-item and tax values for n invoices in one batch"""
+    rng = rng or np.random.default_rng()
+    # Dates fall in the last 3 months
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=90)
+    columns = {
+        "invoice_date": sample_dates(start_date, end_date, n, rng),
+        "num_items": rng.integers(2, 4, n, endpoint=True),
+        "quantities": rng.integers(1, 20, (n, 4), endpoint=True),
+        "unit_prices": rng.integers(50, 300, (n, 4), endpoint=True),
+        "tax_rate": rng.uniform(0.05, 0.09, n)
+    }
+    return [{key: values[i].tolist() for key, values in columns.items()} for i in range(n)]
 
-def generate_random_date(start_date, end_date):
-    """Generate a random date between start_date and end_date"""
-    time_between_dates = end_date - start_date
-    days_between_dates = time_between_dates.days
-    random_number_of_days = random.randrange(days_between_dates)
-    return start_date + timedelta(days=random_number_of_days)
+def build_static_header(c: canvas.Canvas) -> None:
+    """Define the invoice labels and table rules that never change as the "hdr" form XObject"""
+    c.beginForm("hdr")
+    c.setFont("Helvetica-Bold", 14)
+    c.drawString(400, 750, "INVOICE")
+    c.setFont("Helvetica-Bold", 12)
+    c.drawString(50, 650, "Bill To:")
+    
+    # Line-item table header
+    c.setStrokeColorRGB(0, 0, 0)
+    c.line(50, 550, 550, 550)
+    c.drawString(50, 530, "Description")
+    c.drawString(300, 530, "Quantity")
+    c.drawString(370, 530, "Unit Price")
+    c.drawString(450, 530, "Amount")
+    c.line(50, 520, 550, 520)
+    c.endForm()
 
-def create_invoice_pdf(company_index):
+def create_invoice_pdf(company_index: int, sampled: Dict[str, Any], seed: Optional[int] = None) -> str:
     """Create a sample invoice PDF for testing"""
+    # Use a private generator so forked workers don't share the inherited module state;
+    # without a seed it draws fresh entropy from the OS on every call
+    rng = random.Random(seed)
+    
     # Set random values for this invoice
     company = COMPANIES[company_index]
-    invoice_number = generate_invoice_number()
+    invoice_number = generate_invoice_number(rng)
     
-    # Generate date in the last 3 months
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=90)
-    invoice_date = generate_random_date(start_date, end_date)
+    invoice_date = sampled["invoice_date"]
     due_date = invoice_date + timedelta(days=30)
     
     # Format dates
@@ -57,71 +109,59 @@ def create_invoice_pdf(company_index):
     
     # Create PDF
     output_path = f"sample_invoice_{company_index+1}.pdf"
-    c = canvas.Canvas(output_path, pagesize=letter)
+    c = canvas.Canvas(output_path, pagesize=letter, pageCompression=PAGE_COMPRESSION)
+    build_static_header(c)
+    c.doForm("hdr")
     
     # Add company header
     c.setFont("Helvetica-Bold", 16)
     c.drawString(50, 750, company)
-    c.setFont("Helvetica", 12)
-    c.drawString(50, 735, f"{123 + company_index} Business Avenue")
-    c.drawString(50, 720, f"Cityville, State {10000 + company_index * 1000}")
-    c.drawString(50, 705, f"Phone: (555) {100 + company_index}-{4000 + company_index}")
+    draw_block(c, 50, 735, "Helvetica", 12, COMPANY_ADDRESSES[company_index])
     
     # Add invoice header
-    c.setFont("Helvetica-Bold", 14)
-    c.drawString(400, 750, "INVOICE")
-    c.setFont("Helvetica", 11)
-    c.drawString(400, 735, f"Invoice #: {invoice_number}")
-    c.drawString(400, 720, f"Date: {invoice_date_str}")
-    c.drawString(400, 705, f"Due Date: {due_date_str}")
+    draw_block(c, 400, 735, "Helvetica", 11, [
+        f"Invoice #: {invoice_number}",
+        f"Date: {invoice_date_str}",
+        f"Due Date: {due_date_str}"
+    ])
     
     # Add customer info
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(50, 650, "Bill To:")
-    c.setFont("Helvetica", 11)
-    c.drawString(50, 635, f"Customer {company_index + 1} Ltd.")
-    c.drawString(50, 620, f"Attn: Customer Contact {company_index + 1}")
-    c.drawString(50, 605, f"{400 + company_index * 10} Client Street")
-    c.drawString(50, 590, f"Customertown, State {54000 + company_index * 100}")
-    
-    # Add table header
-    c.setStrokeColorRGB(0, 0, 0)
-    c.line(50, 550, 550, 550)
-    
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(50, 530, "Description")
-    c.drawString(300, 530, "Quantity")
-    c.drawString(370, 530, "Unit Price")
-    c.drawString(450, 530, "Amount")
-    
-    c.line(50, 520, 550, 520)
+    draw_block(c, 50, 635, "Helvetica", 11, CUSTOMER_ADDRESSES[company_index])
     
     # Add line items
     y_position = 500
-    total = 0
-    
-    # Generate between 2 and 4 line items
-    num_items = random.randint(2, 4)
-    for i in range(num_items):
-        service = random.choice(SERVICES)
-        quantity = random.randint(1, 20)
-        unit_price = random.randint(50, 300)
-        amount = quantity * unit_price
-        total += amount
-        
-        c.setFont("Helvetica", 11)
-        c.drawString(50, y_position, service)
-        c.drawString(300, y_position, str(quantity))
-        c.drawString(370, y_position, f"${unit_price:.2f}")
-        c.drawString(450, y_position, f"${amount:.2f}")
-        
-        y_position -= 20
+    
+    # Generate between 2 and 4 line items, formatting each column in one vectorized call
+    num_items = sampled["num_items"]
+    services = rng.choices(SERVICES, k=num_items)
+    quantities = np.array(sampled["quantities"][:num_items])
+    unit_prices = np.array(sampled["unit_prices"][:num_items])
+    amounts = quantities * unit_prices
+    total = int(amounts.sum())
+    item_rows = list(zip(services, quantities.astype(str),
+                         np.char.mod("$%.2f", unit_prices), np.char.mod("$%.2f", amounts)))
+    
+    # Draw the item grid as one flowable; zero padding puts each baseline on its row bottom
+    table = Table(item_rows, colWidths=[250, 70, 80, 100], rowHeights=20)
+    table.setStyle(TableStyle([
+        ('FONT', (0, 0), (-1, -1), 'Helvetica', 11, 11),
+        ('LEFTPADDING', (0, 0), (-1, -1), 0),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 0),
+        ('TOPPADDING', (0, 0), (-1, -1), 0),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 0)
+    ]))
+    table.wrapOn(c, 500, 200)
+    y_position -= 20 * num_items
+    table.drawOn(c, 50, y_position + 20)
+    
+    # The table restores the canvas state, so select the totals font explicitly
+    c.setFont("Helvetica", 11)
     
     # Add totals
     c.line(50, y_position - 10, 550, y_position - 10)
     
     # Calculate tax and total
-    tax_rate = random.uniform(0.05, 0.09)  # 5-9% tax rate
+    tax_rate = sampled["tax_rate"]  # 5-9% tax rate
     tax = total * tax_rate
     grand_total = total + tax
     
@@ -142,31 +182,40 @@ def create_invoice_pdf(company_index):
     y_position -= 40
     c.setFont("Helvetica-Bold", 11)
     c.drawString(50, y_position, "Payment Information:")
-    c.setFont("Helvetica", 11)
-    y_position -= 20
-    c.drawString(50, y_position, f"Bank: {company} Financial")
     y_position -= 20
-    c.drawString(50, y_position, f"Account: {random.randint(10000000, 99999999)}")
-    y_position -= 20
-    c.drawString(50, y_position, f"Routing: {random.randint(100000000, 999999999)}")
+    draw_block(c, 50, y_position, "Helvetica", 11, [
+        f"Bank: {company} Financial",
+        f"Account: {rng.randint(10000000, 99999999)}",
+        f"Routing: {rng.randint(100000000, 999999999)}"
+    ], leading=20)
+    y_position -= 40
     
     # Add notes
     y_position -= 40
     c.setFont("Helvetica-Bold", 11)
     c.drawString(50, y_position, "Notes:")
-    c.setFont("Helvetica", 11)
     y_position -= 20
-    c.drawString(50, y_position, "Please make payment within 30 days.")
-    y_position -= 20
-    c.drawString(50, y_position, "Thank you for your business!")
+    draw_block(c, 50, y_position, "Helvetica", 11, [
+        "Please make payment within 30 days.",
+        "Thank you for your business!"
+    ], leading=20)
     
     # Save the PDF
     c.save()
-    print(f"Created sample invoice: {output_path}")
     return output_path
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate sample invoice PDFs")
+    parser.add_argument("--seed", type=int,
+                        help="Seed for reproducible invoices (different random values on every run by default)")
+    args = parser.parse_args()
+    
     print("Generating 5 sample invoice PDFs...")
-    for i in range(5):
-        create_invoice_pdf(i)
+    
+    # A fixed seed gives each document its own derived seed, otherwise every run varies
+    seeds = [None] * 5 if args.seed is None else [args.seed + i for i in range(5)]
+    values_rng = None if args.seed is None else np.random.default_rng(args.seed)
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        paths = list(executor.map(create_invoice_pdf, range(5), sample_invoice_values(5, values_rng), seeds))
+    sys.stdout.write("\n".join(f"Created sample invoice: {path}" for path in paths) + "\n")
     print("Done!") 
\ No newline at end of file
@@ -1,107 +1,108 @@
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import letter
 import os
+import io
+import sys
+import functools
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from sample_utils import PAGE_COMPRESSION
+
+# Every string on the sample invoice as (x, y, font, size, text)
+INVOICE_TEXT = (
+    # Company header
+    (50, 750, "Helvetica-Bold", 16, "ACME Corp"),
+    (50, 735, "Helvetica", 12, "123 Business Ave"),
+    (50, 720, "Helvetica", 12, "Cityville, State 12345"),
+    (50, 705, "Helvetica", 12, "Phone: (555) 123-4567"),
+
+    # Invoice header
+    (400, 750, "Helvetica-Bold", 14, "INVOICE"),
+    (400, 735, "Helvetica", 11, "Invoice #: INV-2023-001"),
+    (400, 720, "Helvetica", 11, "Date: 03/18/2023"),
+    (400, 705, "Helvetica", 11, "Due Date: 04/18/2023"),
+
+    # Customer info
+    (50, 650, "Helvetica-Bold", 12, "Bill To:"),
+    (50, 635, "Helvetica", 11, "Customer Company Ltd."),
+    (50, 620, "Helvetica", 11, "Attn: John Smith"),
+    (50, 605, "Helvetica", 11, "456 Client Street"),
+    (50, 590, "Helvetica", 11, "Customertown, State 54321"),
+
+    # Table header
+    (50, 530, "Helvetica-Bold", 12, "Description"),
+    (300, 530, "Helvetica-Bold", 12, "Quantity"),
+    (370, 530, "Helvetica-Bold", 12, "Unit Price"),
+    (450, 530, "Helvetica-Bold", 12, "Amount"),
+
+    # Line items
+    (50, 500, "Helvetica", 11, "Professional Services"),
+    (300, 500, "Helvetica", 11, "10"),
+    (370, 500, "Helvetica", 11, "$150.00"),
+    (450, 500, "Helvetica", 11, "$1,500.00"),
+    (50, 480, "Helvetica", 11, "Software License"),
+    (300, 480, "Helvetica", 11, "1"),
+    (370, 480, "Helvetica", 11, "$2,000.00"),
+    (450, 480, "Helvetica", 11, "$2,000.00"),
+    (50, 460, "Helvetica", 11, "Support Subscription"),
+    (300, 460, "Helvetica", 11, "12"),
+    (370, 460, "Helvetica", 11, "$75.00"),
+    (450, 460, "Helvetica", 11, "$900.00"),
+
+    # Totals
+    (350, 380, "Helvetica", 11, "Subtotal:"),
+    (450, 380, "Helvetica", 11, "$4,400.00"),
+    (350, 360, "Helvetica", 11, "Tax (7%):"),
+    (450, 360, "Helvetica", 11, "$308.00"),
+    (350, 340, "Helvetica-Bold", 12, "Total:"),
+    (450, 340, "Helvetica-Bold", 12, "$4,708.00"),
+
+    # Payment information
+    (50, 280, "Helvetica-Bold", 11, "Payment Information:"),
+    (50, 260, "Helvetica", 11, "Bank: First National Bank"),
+    (50, 240, "Helvetica", 11, "Account: 1234567890"),
+    (50, 220, "Helvetica", 11, "Routing: 987654321"),
+
+    # Notes
+    (50, 180, "Helvetica-Bold", 11, "Notes:"),
+    (50, 160, "Helvetica", 11, "Please make payment within 30 days."),
+    (50, 140, "Helvetica", 11, "Thank you for your business!")
+)
+
+# Horizontal rules around the line-item table as (x1, y1, x2, y2)
+INVOICE_RULES = (
+    (50, 550, 550, 550),
+    (50, 520, 550, 520),
+    (50, 400, 550, 400)
+)
+
+@functools.lru_cache(maxsize=1)
+def _sample_invoice_bytes() -> bytes:
+    """Render the sample invoice once and return the PDF bytes"""
+    buf = io.BytesIO()
+    c = canvas.Canvas(buf, pagesize=letter, pageCompression=PAGE_COMPRESSION)
 
-def create_sample_invoice():
-    """Create a simple invoice PDF for testing the PDF analyzer"""
-    output_path = "sample_invoice.pdf"
-    c = canvas.Canvas(output_path, pagesize=letter)
-    
-    # Add company header
-    c.setFont("Helvetica-Bold", 16)
-    c.drawString(50, 750, "ACME Corp")
-    c.setFont("Helvetica", 12)
-    c.drawString(50, 735, "123 Business Ave")
-    c.drawString(50, 720, "Cityville, State 12345")
-    c.drawString(50, 705, "Phone: (555) 123-4567")
-    
-    # Add invoice header
-    c.setFont("Helvetica-Bold", 14)
-    c.drawString(400, 750, "INVOICE")
-    c.setFont("Helvetica", 11)
-    c.drawString(400, 735, "Invoice #: INV-2023-001")
-    c.drawString(400, 720, "Date: 03/18/2023")
-    c.drawString(400, 705, "Due Date: 04/18/2023")
-    
-    # Add customer info
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(50, 650, "Bill To:")
-    c.setFont("Helvetica", 11)
-    c.drawString(50, 635, "Customer Company Ltd.")
-    c.drawString(50, 620, "Attn: John Smith")
-    c.drawString(50, 605, "456 Client Street")
-    c.drawString(50, 590, "Customertown, State 54321")
-    
-    # Add table header
     c.setStrokeColorRGB(0, 0, 0)
-    c.line(50, 550, 550, 550)
-    
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(50, 530, "Description")
-    c.drawString(300, 530, "Quantity")
-    c.drawString(370, 530, "Unit Price")
-    c.drawString(450, 530, "Amount")
-    
-    c.line(50, 520, 550, 520)
-    
-    # Add line items
-    y_position = 500
-    
-    # Item 1
-    c.setFont("Helvetica", 11)
-    c.drawString(50, y_position, "Professional Services")
-    c.drawString(300, y_position, "10")
-    c.drawString(370, y_position, "$150.00")
-    c.drawString(450, y_position, "$1,500.00")
-    
-    y_position -= 20
-    
-    # Item 2
-    c.drawString(50, y_position, "Software License")
-    c.drawString(300, y_position, "1")
-    c.drawString(370, y_position, "$2,000.00")
-    c.drawString(450, y_position, "$2,000.00")
-    
-    y_position -= 20
-    
-    # Item 3
-    c.drawString(50, y_position, "Support Subscription")
-    c.drawString(300, y_position, "12")
-    c.drawString(370, y_position, "$75.00")
-    c.drawString(450, y_position, "$900.00")
-    
-    # Add totals
-    c.line(50, 400, 550, 400)
-    
-    c.drawString(350, 380, "Subtotal:")
-    c.drawString(450, 380, "$4,400.00")
-    
-    c.drawString(350, 360, "Tax (7%):")
-    c.drawString(450, 360, "$308.00")
-    
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(350, 340, "Total:")
-    c.drawString(450, 340, "$4,708.00")
-    
-    # Add payment information
-    c.setFont("Helvetica-Bold", 11)
-    c.drawString(50, 280, "Payment Information:")
-    c.setFont("Helvetica", 11)
-    c.drawString(50, 260, "Bank: First National Bank")
-    c.drawString(50, 240, "Account: 1234567890")
-    c.drawString(50, 220, "Routing: 987654321")
-    
-    # Add notes
-    c.setFont("Helvetica-Bold", 11)
-    c.drawString(50, 180, "Notes:")
-    c.setFont("Helvetica", 11)
-    c.drawString(50, 160, "Please make payment within 30 days.")
-    c.drawString(50, 140, "Thank you for your business!")
-    
+    for x1, y1, x2, y2 in INVOICE_RULES:
+        c.line(x1, y1, x2, y2)
+
+    current_font = None
+    for x, y, font, size, text in INVOICE_TEXT:
+        if (font, size) != current_font:
+            c.setFont(font, size)
+            current_font = (font, size)
+        c.drawString(x, y, text)
+
     # Save the PDF
     c.save()
-    print(f"Sample invoice created: {os.path.abspath(output_path)}")
+    return buf.getvalue()
+
+def create_sample_invoice() -> str:
+    """Create a simple invoice PDF for testing the PDF analyzer"""
+    output_path = "sample_invoice.pdf"
+    with open(output_path, "wb") as f:
+        f.write(_sample_invoice_bytes())
     return output_path
 
 if __name__ == "__main__":
-    create_sample_invoice() 
\ No newline at end of file
+    print(f"Sample invoice created: {create_sample_invoice()}")
@@ -1,9 +1,19 @@
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import letter
 from reportlab.lib import colors
+from reportlab.platypus import Table, TableStyle
 import os
+import argparse
+import sys
 import random
+import textwrap
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from sample_utils import sample_dates, draw_block, PAGE_COMPRESSION
 
 # List of report titles
 REPORT_TITLES = [
@@ -41,26 +51,89 @@ TRENDS = [
     "challenges with opportunities", "promising indicators", "areas for improvement"
 ]
 
-def generate_random_date(start_date, end_date):
-    """Generate a random date between start_date and end_date"""
-    time_between_dates = end_date - start_date
-    days_between_dates = time_between_dates.days
-    random_number_of_days = random.randrange(days_between_dates)
-    return start_date + timedelta(days=random_number_of_days)
+# Outlook templates and the options substituted into them
+OUTLOOK_TEMPLATES = [
+    "Based on current trends, we project {trend} in {next_period}. The company is {position} to meet annual targets. Strategic initiatives in {initiative_area} are expected to drive additional growth in the {timeline}.",
+    "Our analysis indicates {trend} moving into {next_period}. Key opportunities exist in {initiative_area}, which should be prioritized in the {timeline}.",
+    "Looking ahead to {next_period}, we anticipate {trend}. Success will depend on effectively executing our strategy in {initiative_area} over the {timeline}."
+]
+OUTLOOK_TRENDS = ["continued growth", "stabilization", "marginal improvement", "significant progress"]
+OUTLOOK_POSITIONS = ["well-positioned", "on track", "taking steps", "implementing strategies"]
+OUTLOOK_INITIATIVES = ["product development", "market expansion", "operational efficiency", "customer retention", "digital transformation"]
+OUTLOOK_TIMELINES = ["coming months", "second half of the year", "next two quarters", "near term"]
+
+# Sizes of the option lists each report picks from, in the order the picks are used;
+# the next-period options are built per report but always number three
+CHOICE_SIZES = [
+    len(FOCUS_AREAS), len(IMPROVEMENT_AREAS), len(TRENDS), len(SUMMARY_TEMPLATES),
+    len(OUTLOOK_TEMPLATES), len(OUTLOOK_TRENDS), 3, len(OUTLOOK_POSITIONS),
+    len(OUTLOOK_INITIATIVES), len(OUTLOOK_TIMELINES)
+]
+
+# Display format for each metric's value
+_FMT = {
+    "Revenue": "${:,.1f}K",
+    "Net Profit": "${:,.1f}K",
+    "Operating Expenses": "${:,.1f}K",
+    "Profit Margin": "{:.1f}%",
+    "Customer Acquisition Cost": "${:.2f}",
+    "Customer Lifetime Value": "${:.2f}",
+    "Customer Count": "{:,.0f}"
+}
+
+def sample_report_values(n: int, rng: Optional[np.random.Generator] = None) -> List[Dict[str, Any]]:
+    """Draw the random metric values for n reports in one batch"""
+    rng = rng or np.random.default_rng()
+    # Dates fall in the last 6 months
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=180)
+    columns = {
+        "report_date": sample_dates(start_date, end_date, n, rng),
+        "revenue": rng.uniform(500, 10000, n),
+        "profit_margin": rng.uniform(0.05, 0.30, n),
+        "opex_fraction": rng.uniform(0.3, 0.7, n),
+        "customer_count": rng.integers(100, 10000, n, endpoint=True),
+        "acquisition_cost": rng.uniform(50, 500, n),
+        "lifetime_value": rng.uniform(500, 5000, n),
+        "change_factors": rng.uniform(0.85, 1.15, (n, 7)),
+        "choices": rng.integers(0, CHOICE_SIZES, (n, len(CHOICE_SIZES)))
+    }
+    return [{key: values[i].tolist() for key, values in columns.items()} for i in range(n)]
 
-def create_report_pdf(index):
+def build_static_frame(c: canvas.Canvas) -> None:
+    """Define the section labels, table rules and footer that never change as the "frame" form XObject"""
+    c.beginForm("frame")
+    c.setFont("Helvetica-Bold", 14)
+    c.drawString(50, 650, "Executive Summary:")
+    c.drawString(50, 570, "Key Metrics:")
+    c.drawString(50, 380, "Quarterly Comparison:")
+    c.drawString(50, 200, "Future Outlook:")
+    
+    # Comparison table rules
+    c.setStrokeColorRGB(0, 0, 0)
+    c.line(50, 360, 550, 360)
+    c.line(50, 330, 550, 330)
+    
+    # Footer
+    c.setFont("Helvetica-Oblique", 9)
+    c.drawString(50, 50, "Confidential - For internal use only")
+    c.drawString(400, 50, "Page 1 of 1")
+    c.endForm()
+
+def create_report_pdf(index: int, sampled: Dict[str, Any], seed: Optional[int] = None) -> str:
     """Create a sample report PDF for testing"""
+    # Use a private generator so forked workers don't share the inherited module state;
+    # without a seed it draws fresh entropy from the OS on every call
+    rng = random.Random(seed)
+    
     # Set random values for this report
     title = REPORT_TITLES[index]
     
-    # Generate date in the last 6 months
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=180)
-    report_date = generate_random_date(start_date, end_date)
+    report_date = sampled["report_date"]
     report_date_str = report_date.strftime("%m/%d/%Y")
     
     # Generate a report ID
-    report_id = f"REP-{report_date.year}-{random.randint(1000, 9999)}"
+    report_id = f"REP-{report_date.year}-{rng.randint(1000, 9999)}"
     
     # Generate the quarter and year for the report
     quarter = (report_date.month - 1) // 3 + 1
@@ -68,198 +141,132 @@ def create_report_pdf(index):
     period = f"Q{quarter} {year}"
     
     # Choose random elements for summary
-    focus_area = random.choice(FOCUS_AREAS)
-    improvement_area = random.choice(IMPROVEMENT_AREAS)
-    trend = random.choice(TRENDS)
+    (focus_idx, improvement_idx, trend_idx, summary_idx, outlook_idx, outlook_trend_idx,
+     next_period_idx, position_idx, initiative_idx, timeline_idx) = sampled["choices"]
+    focus_area = FOCUS_AREAS[focus_idx]
+    improvement_area = IMPROVEMENT_AREAS[improvement_idx]
+    trend = TRENDS[trend_idx]
     
     # Format the summary
-    summary_template = random.choice(SUMMARY_TEMPLATES)
+    summary_template = SUMMARY_TEMPLATES[summary_idx]
     summary = summary_template.format(period=period, focus_area=focus_area, 
                                      improvement_area=improvement_area, trend=trend)
     
     # Create the PDF
     output_path = f"sample_report_{index+1}.pdf"
-    c = canvas.Canvas(output_path, pagesize=letter)
+    c = canvas.Canvas(output_path, pagesize=letter, pageCompression=PAGE_COMPRESSION)
+    build_static_frame(c)
+    c.doForm("frame")
     
     # Add report header
     c.setFont("Helvetica-Bold", 18)
     c.drawString(50, 750, title)
     
-    c.setFont("Helvetica", 12)
-    c.drawString(50, 730, f"Prepared by: Analysis Team {index+1}")
-    c.drawString(50, 710, f"Date: {report_date_str}")
-    c.drawString(50, 690, f"Report ID: {report_id}")
-    
-    # Add Executive Summary
-    c.setFont("Helvetica-Bold", 14)
-    c.drawString(50, 650, "Executive Summary:")
+    draw_block(c, 50, 730, "Helvetica", 12, [
+        f"Prepared by: Analysis Team {index+1}",
+        f"Date: {report_date_str}",
+        f"Report ID: {report_id}"
+    ], leading=20)
     
-    c.setFont("Helvetica", 11)
-    y_pos = 630
     # Split the summary into lines
-    for line in [summary[i:i+70] for i in range(0, len(summary), 70)]:
-        c.drawString(60, y_pos, line.strip())
-        y_pos -= 15
-    
-    # Generate random metrics for the report
-    metrics = {}
-    
-    # Revenue (in thousands)
-    metrics["Revenue"] = round(random.uniform(500, 10000), 1)
-    
-    # Net Profit (in thousands)
-    profit_margin = random.uniform(0.05, 0.30)
-    metrics["Net Profit"] = round(metrics["Revenue"] * profit_margin, 1)
-    
-    # Profit Margin (as percentage)
-    metrics["Profit Margin"] = round(profit_margin * 100, 1)
-    
-    # Operating Expenses (in thousands)
-    metrics["Operating Expenses"] = round(metrics["Revenue"] * random.uniform(0.3, 0.7), 1)
+    draw_block(c, 60, 630, "Helvetica", 11,
+               textwrap.wrap(summary, width=70))
+    
+    # Generate random metrics for the report (money in thousands)
+    revenue = round(sampled["revenue"], 1)
+    profit_margin = sampled["profit_margin"]
+    current_metrics = (
+        ("Revenue", revenue),
+        ("Net Profit", round(revenue * profit_margin, 1)),
+        ("Profit Margin", round(profit_margin * 100, 1)),
+        ("Operating Expenses", round(revenue * sampled["opex_fraction"], 1)),
+        ("Customer Count", sampled["customer_count"]),
+        ("Customer Acquisition Cost", round(sampled["acquisition_cost"], 2)),
+        ("Customer Lifetime Value", round(sampled["lifetime_value"], 2))
+    )
     
-    # Customer Metrics
-    metrics["Customer Count"] = random.randint(100, 10000)
-    metrics["Customer Acquisition Cost"] = round(random.uniform(50, 500), 2)
-    metrics["Customer Lifetime Value"] = round(random.uniform(500, 5000), 2)
+    # Pair each metric with its previous quarter value, which differs by -15% to +15%
+    metric_rows = [(metric, value, value / change_factor)
+                   for (metric, value), change_factor in zip(current_metrics, sampled["change_factors"])]
     
     # Add Key Metrics section
-    c.setFont("Helvetica-Bold", 14)
-    c.drawString(50, 570, "Key Metrics:")
-    
-    c.setFont("Helvetica", 11)
-    y_pos = 550
-    for metric, value in metrics.items():
-        # Format the values appropriately based on metric type
-        if metric in ["Revenue", "Net Profit", "Operating Expenses"]:
-            # Format as currency in thousands
-            formatted_value = f"${value:,.1f}K"
-        elif metric in ["Profit Margin"]:
-            # Format as percentage
-            formatted_value = f"{value}%"
-        elif metric in ["Customer Acquisition Cost", "Customer Lifetime Value"]:
-            # Format as currency
-            formatted_value = f"${value:.2f}"
-        else:
-            # Format as number
-            formatted_value = f"{value:,}"
-            
-        c.drawString(60, y_pos, f"{metric}: {formatted_value}")
-        y_pos -= 20
-    
-    # Generate comparison data for previous quarter
-    previous_metrics = {}
-    for metric, value in metrics.items():
-        # Previous quarter values differ by -15% to +15%
-        change_factor = random.uniform(0.85, 1.15)
-        previous_metrics[metric] = value / change_factor
+    metric_lines = [f"{metric}: {_FMT[metric].format(value)}" for metric, value, _ in metric_rows]
+    draw_block(c, 60, 550, "Helvetica", 11, metric_lines, leading=20)
     
     # Add Quarterly Comparison Table
-    c.setFont("Helvetica-Bold", 14)
-    c.drawString(50, 380, "Quarterly Comparison:")
-    
-    # Table header
-    c.setStrokeColorRGB(0, 0, 0)
-    c.line(50, 360, 550, 360)
-    
-    c.setFont("Helvetica-Bold", 11)
-    c.drawString(60, 340, "Metric")
     previous_quarter = f"Q{quarter-1 if quarter > 1 else 4} {year if quarter > 1 else year-1}"
-    c.drawString(180, 340, previous_quarter)
-    c.drawString(280, 340, period)
-    c.drawString(380, 340, "Change (%)")
-    
-    c.line(50, 330, 550, 330)
-    
-    # Table data
-    y_pos = 310
+    table_data = [["Metric", previous_quarter, period, "Change (%)"]]
+    # Header baseline sits 10pt above the rule at 330, zero padding puts the
+    # other baselines on their row bottoms
+    table_style = [
+        ('FONT', (0, 0), (-1, 0), 'Helvetica-Bold', 11, 11),
+        ('FONT', (0, 1), (-1, -1), 'Helvetica', 11, 11),
+        ('LEFTPADDING', (0, 0), (-1, -1), 0),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 0),
+        ('TOPPADDING', (0, 0), (-1, -1), 0),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 0),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 10)
+    ]
     
     # Select 5 metrics to show in the comparison table
-    comparison_metrics = random.sample(list(metrics.keys()), min(5, len(metrics)))
+    comparison_rows = rng.sample(metric_rows, min(5, len(metric_rows)))
     
-    for metric in comparison_metrics:
-        current_value = metrics[metric]
-        previous_value = previous_metrics[metric]
-        
+    for row, (metric, current_value, previous_value) in enumerate(comparison_rows, start=1):
         # Calculate percent change
         pct_change = ((current_value - previous_value) / previous_value) * 100
         is_positive = pct_change >= 0
         
         # Format values
-        if metric in ["Revenue", "Net Profit", "Operating Expenses"]:
-            current_str = f"${current_value:,.1f}K"
-            previous_str = f"${previous_value:,.1f}K"
-        elif metric in ["Profit Margin"]:
-            current_str = f"{current_value}%"
-            previous_str = f"{previous_value:.1f}%"
-        elif metric in ["Customer Acquisition Cost", "Customer Lifetime Value"]:
-            current_str = f"${current_value:.2f}"
-            previous_str = f"${previous_value:.2f}"
-        else:
-            current_str = f"{int(current_value):,}"
-            previous_str = f"{int(previous_value):,}"
+        current_str = _FMT[metric].format(current_value)
+        previous_str = _FMT[metric].format(previous_value)
             
         # Format the change percentage
         change_str = f"{'+' if is_positive else ''}{pct_change:.1f}%"
         
-        c.setFont("Helvetica", 11)
-        c.drawString(60, y_pos, metric)
-        c.drawString(180, y_pos, previous_str)
-        c.drawString(280, y_pos, current_str)
+        table_data.append([metric, previous_str, current_str, change_str])
         
         # Set color based on positive/negative change
-        if is_positive:
-            c.setFillColorRGB(0, 0.5, 0)  # Green for positive
-        else:
-            c.setFillColorRGB(0.8, 0, 0)  # Red for negative
-        c.drawString(380, y_pos, change_str)
-        c.setFillColorRGB(0, 0, 0)  # Reset to black
-        
-        y_pos -= 20
+        change_color = colors.Color(0, 0.5, 0) if is_positive else colors.Color(0.8, 0, 0)
+        table_style.append(('TEXTCOLOR', (3, row), (3, row), change_color))
     
-    # Add Future Outlook section
-    c.setFont("Helvetica-Bold", 14)
-    c.drawString(50, 200, "Future Outlook:")
+    # Draw the whole grid as one flowable, first data row on y=310
+    table = Table(table_data, colWidths=[120, 100, 100, 120],
+                  rowHeights=[30] + [20] * len(comparison_rows))
+    table.setStyle(TableStyle(table_style))
+    table.wrapOn(c, 500, 200)
+    table.drawOn(c, 60, 310 - 20 * (len(comparison_rows) - 1))
     
-    # Generate a random outlook
-    outlook_templates = [
-        "Based on current trends, we project {trend} in {next_period}. The company is {position} to meet annual targets. Strategic initiatives in {initiative_area} are expected to drive additional growth in the {timeline}.",
-        "Our analysis indicates {trend} moving into {next_period}. Key opportunities exist in {initiative_area}, which should be prioritized in the {timeline}.",
-        "Looking ahead to {next_period}, we anticipate {trend}. Success will depend on effectively executing our strategy in {initiative_area} over the {timeline}."
-    ]
-    
-    trend_options = ["continued growth", "stabilization", "marginal improvement", "significant progress"]
+    # Generate a random outlook for the Future Outlook section
     next_period_options = [f"Q{(quarter % 4) + 1}", "the next two quarters", "the remainder of the year"]
-    position_options = ["well-positioned", "on track", "taking steps", "implementing strategies"]
-    initiative_area_options = ["product development", "market expansion", "operational efficiency", "customer retention", "digital transformation"]
-    timeline_options = ["coming months", "second half of the year", "next two quarters", "near term"]
     
-    outlook_text = random.choice(outlook_templates).format(
-        trend=random.choice(trend_options),
-        next_period=random.choice(next_period_options),
-        position=random.choice(position_options),
-        initiative_area=random.choice(initiative_area_options),
-        timeline=random.choice(timeline_options)
+    outlook_text = OUTLOOK_TEMPLATES[outlook_idx].format(
+        trend=OUTLOOK_TRENDS[outlook_trend_idx],
+        next_period=next_period_options[next_period_idx],
+        position=OUTLOOK_POSITIONS[position_idx],
+        initiative_area=OUTLOOK_INITIATIVES[initiative_idx],
+        timeline=OUTLOOK_TIMELINES[timeline_idx]
     )
     
-    c.setFont("Helvetica", 11)
-    y_pos = 180
     # Split the outlook into lines
-    for line in [outlook_text[i:i+70] for i in range(0, len(outlook_text), 70)]:
-        c.drawString(60, y_pos, line.strip())
-        y_pos -= 15
-    
-    # Add footer
-    c.setFont("Helvetica-Oblique", 9)
-    c.drawString(50, 50, "Confidential - For internal use only")
-    c.drawString(400, 50, "Page 1 of 1")
+    draw_block(c, 60, 180, "Helvetica", 11,
+               textwrap.wrap(outlook_text, width=70))
     
     # Save the PDF
     c.save()
-    print(f"Created sample report: {output_path}")
     return output_path
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate sample report PDFs")
+    parser.add_argument("--seed", type=int,
+                        help="Seed for reproducible reports (different random values on every run by default)")
+    args = parser.parse_args()
+    
     print("Generating 5 sample report PDFs...")
-    for i in range(5):
-        create_report_pdf(i)
+    
+    # A fixed seed gives each document its own derived seed, otherwise every run varies
+    seeds = [None] * 5 if args.seed is None else [args.seed + i for i in range(5)]
+    values_rng = None if args.seed is None else np.random.default_rng(args.seed)
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        paths = list(executor.map(create_report_pdf, range(5), sample_report_values(5, values_rng), seeds))
+    sys.stdout.write("\n".join(f"Created sample report: {path}" for path in paths) + "\n")
     print("Done!") 
\ No newline at end of file
@@ -1,123 +1,119 @@
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import letter
 import os
+import io
+import sys
+import functools
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from sample_utils import PAGE_COMPRESSION
+
+# Every black string on the sample report as (x, y, font, size, text)
+REPORT_TEXT = (
+    # Report header
+    (50, 750, "Helvetica-Bold", 18, "Financial Performance Report"),
+    (50, 730, "Helvetica", 12, "Prepared by: Financial Analysis Team"),
+    (50, 710, "Helvetica", 12, "Date: 03/18/2023"),
+    (50, 690, "Helvetica", 12, "Report ID: REP-2023-Q1"),
+
+    # Executive summary
+    (50, 650, "Helvetica-Bold", 14, "Executive Summary:"),
+    (60, 630, "Helvetica", 11, "This report provides an analysis of the company's financial performance for Q1 2023."),
+    (60, 615, "Helvetica", 11, "Overall performance shows strong revenue growth with increased profitability compared"),
+    (60, 600, "Helvetica", 11, "to the previous quarter. Key metrics indicate positive trends in all business segments."),
+
+    # Key metrics
+    (50, 570, "Helvetica-Bold", 14, "Key Metrics:"),
+    (60, 550, "Helvetica", 11, "Revenue: $4,250,000"),
+    (60, 530, "Helvetica", 11, "Net Profit: $825,000"),
+    (60, 510, "Helvetica", 11, "Profit Margin: 19.4%"),
+    (60, 490, "Helvetica", 11, "Operating Expenses: $1,125,000"),
+    (60, 470, "Helvetica", 11, "Customer Acquisition Cost: $125"),
+    (60, 450, "Helvetica", 11, "Customer Lifetime Value: $1,250"),
+
+    # Quarterly comparison
+    (50, 380, "Helvetica-Bold", 14, "Quarterly Comparison:"),
+    (60, 340, "Helvetica-Bold", 12, "Metric"),
+    (200, 340, "Helvetica-Bold", 12, "Q4 2022"),
+    (300, 340, "Helvetica-Bold", 12, "Q1 2023"),
+    (400, 340, "Helvetica-Bold", 12, "Change (%)"),
+    (60, 310, "Helvetica", 11, "Revenue"),
+    (200, 310, "Helvetica", 11, "$3,950,000"),
+    (300, 310, "Helvetica", 11, "$4,250,000"),
+    (60, 290, "Helvetica", 11, "Net Profit"),
+    (200, 290, "Helvetica", 11, "$750,000"),
+    (300, 290, "Helvetica", 11, "$825,000"),
+    (60, 270, "Helvetica", 11, "Profit Margin"),
+    (200, 270, "Helvetica", 11, "19.0%"),
+    (300, 270, "Helvetica", 11, "19.4%"),
+    (60, 250, "Helvetica", 11, "Operating Expenses"),
+    (200, 250, "Helvetica", 11, "$1,200,000"),
+    (300, 250, "Helvetica", 11, "$1,125,000"),
+    (60, 230, "Helvetica", 11, "Customer Count"),
+    (200, 230, "Helvetica", 11, "15,200"),
+    (300, 230, "Helvetica", 11, "16,800"),
+
+    # Future outlook
+    (50, 200, "Helvetica-Bold", 14, "Future Outlook:"),
+    (60, 180, "Helvetica", 11, "Based on current trends, we project continued growth in Q2 2023. The company is on"),
+    (60, 165, "Helvetica", 11, "track to meet or exceed annual targets. Strategic initiatives in product development"),
+    (60, 150, "Helvetica", 11, "and market expansion are expected to drive additional growth in the second half of"),
+    (60, 135, "Helvetica", 11, "the year. We recommend maintaining the current investment strategy while exploring"),
+    (60, 120, "Helvetica", 11, "opportunities in emerging markets."),
+
+    # Footer
+    (50, 50, "Helvetica-Oblique", 9, "Confidential - For internal use only"),
+    (400, 50, "Helvetica-Oblique", 9, "Page 1 of 1")
+)
+
+# Comparison-table change cells as (x, y, rgb, text), green for gains and red for losses
+REPORT_CHANGES = (
+    (400, 310, (0, 0.5, 0), "+7.6%"),
+    (400, 290, (0, 0.5, 0), "+10.0%"),
+    (400, 270, (0, 0.5, 0), "+2.1%"),
+    (400, 250, (0.8, 0, 0), "-6.2%"),
+    (400, 230, (0, 0.5, 0), "+10.5%")
+)
+
+# Horizontal rules around the comparison table header as (x1, y1, x2, y2)
+REPORT_RULES = (
+    (50, 360, 550, 360),
+    (50, 330, 550, 330)
+)
+
+@functools.lru_cache(maxsize=1)
+def _sample_report_bytes() -> bytes:
+    """Render the sample report once and return the PDF bytes"""
+    buf = io.BytesIO()
+    c = canvas.Canvas(buf, pagesize=letter, pageCompression=PAGE_COMPRESSION)
 
-def create_sample_report():
-    """Create a simple report PDF for testing the PDF analyzer"""
-    output_path = "sample_report.pdf"
-    c = canvas.Canvas(output_path, pagesize=letter)
-    
-    # Add report header
-    c.setFont("Helvetica-Bold", 18)
-    c.drawString(50, 750, "Financial Performance Report")
-    
-    c.setFont("Helvetica", 12)
-    c.drawString(50, 730, "Prepared by: Financial Analysis Team")
-    c.drawString(50, 710, "Date: 03/18/2023")
-    c.drawString(50, 690, "Report ID: REP-2023-Q1")
-    
-    # Add Executive Summary
-    c.setFont("Helvetica-Bold", 14)
-    c.drawString(50, 650, "Executive Summary:")
-    
-    c.setFont("Helvetica", 11)
-    summary_text = """
-    This report provides an analysis of the company's financial performance for Q1 2023.
-    Overall performance shows strong revenue growth with increased profitability compared
-    to the previous quarter. Key metrics indicate positive trends in all business segments.
-    """
-    y_pos = 630
-    for line in summary_text.strip().split('\n'):
-        c.drawString(60, y_pos, line.strip())
-        y_pos -= 15
-    
-    # Add Key Metrics section
-    c.setFont("Helvetica-Bold", 14)
-    c.drawString(50, 570, "Key Metrics:")
-    
-    c.setFont("Helvetica", 11)
-    metrics = [
-        ("Revenue", "$4,250,000"),
-        ("Net Profit", "$825,000"),
-        ("Profit Margin", "19.4%"),
-        ("Operating Expenses", "$1,125,000"),
-        ("Customer Acquisition Cost", "$125"),
-        ("Customer Lifetime Value", "$1,250")
-    ]
-    
-    y_pos = 550
-    for metric, value in metrics:
-        c.drawString(60, y_pos, f"{metric}: {value}")
-        y_pos -= 20
-    
-    # Add Quarterly Comparison Table
-    c.setFont("Helvetica-Bold", 14)
-    c.drawString(50, 380, "Quarterly Comparison:")
-    
-    # Table header
     c.setStrokeColorRGB(0, 0, 0)
-    c.line(50, 360, 550, 360)
-    
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(60, 340, "Metric")
-    c.drawString(200, 340, "Q4 2022")
-    c.drawString(300, 340, "Q1 2023")
-    c.drawString(400, 340, "Change (%)")
-    
-    c.line(50, 330, 550, 330)
-    
-    # Table data
-    comparison_data = [
-        ("Revenue", "$3,950,000", "$4,250,000", "+7.6%"),
-        ("Net Profit", "$750,000", "$825,000", "+10.0%"),
-        ("Profit Margin", "19.0%", "19.4%", "+2.1%"),
-        ("Operating Expenses", "$1,200,000", "$1,125,000", "-6.2%"),
-        ("Customer Count", "15,200", "16,800", "+10.5%")
-    ]
-    
-    y_pos = 310
-    for data in comparison_data:
-        c.setFont("Helvetica", 11)
-        c.drawString(60, y_pos, data[0])
-        c.drawString(200, y_pos, data[1])
-        c.drawString(300, y_pos, data[2])
-        
-        # Change percent (colored based on positive/negative)
-        if data[3].startswith("+"):
-            c.setFillColorRGB(0, 0.5, 0)  # Green for positive
-        else:
-            c.setFillColorRGB(0.8, 0, 0)  # Red for negative
-        c.drawString(400, y_pos, data[3])
-        c.setFillColorRGB(0, 0, 0)  # Reset to black
-        
-        y_pos -= 20
-    
-    # Add Future Outlook section
-    c.setFont("Helvetica-Bold", 14)
-    c.drawString(50, 200, "Future Outlook:")
-    
+    for x1, y1, x2, y2 in REPORT_RULES:
+        c.line(x1, y1, x2, y2)
+
+    current_font = None
+    for x, y, font, size, text in REPORT_TEXT:
+        if (font, size) != current_font:
+            c.setFont(font, size)
+            current_font = (font, size)
+        c.drawString(x, y, text)
+
     c.setFont("Helvetica", 11)
-    outlook_text = """
-    Based on current trends, we project continued growth in Q2 2023. The company is on
-    track to meet or exceed annual targets. Strategic initiatives in product development
-    and market expansion are expected to drive additional growth in the second half of
-    the year. We recommend maintaining the current investment strategy while exploring
-    opportunities in emerging markets.
-    """
-    y_pos = 180
-    for line in outlook_text.strip().split('\n'):
-        c.drawString(60, y_pos, line.strip())
-        y_pos -= 15
-    
-    # Add footer
-    c.setFont("Helvetica-Oblique", 9)
-    c.drawString(50, 50, "Confidential - For internal use only")
-    c.drawString(400, 50, "Page 1 of 1")
-    
+    for x, y, rgb, text in REPORT_CHANGES:
+        c.setFillColorRGB(*rgb)
+        c.drawString(x, y, text)
+    c.setFillColorRGB(0, 0, 0)  # Reset to black
+
     # Save the PDF
     c.save()
-    print(f"Sample report created: {os.path.abspath(output_path)}")
+    return buf.getvalue()
+
+def create_sample_report() -> str:
+    """Create a simple report PDF for testing the PDF analyzer"""
+    output_path = "sample_report.pdf"
+    with open(output_path, "wb") as f:
+        f.write(_sample_report_bytes())
     return output_path
 
 if __name__ == "__main__":
-    create_sample_report() 
\ No newline at end of file
+    print(f"Sample report created: {create_sample_report()}")
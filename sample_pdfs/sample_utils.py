@@ -0,0 +1,31 @@
+"""Helpers shared by the sample PDF generators"""
+
+import os
+import numpy as np
+from datetime import datetime
+from typing import Optional, Sequence
+from reportlab.pdfgen import canvas
+
+
+def sample_dates(start_date: datetime, end_date: datetime, n: int,
+                 rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """Draw n random dates between start_date and end_date in a single RNG call"""
+    rng = rng or np.random.default_rng()
+    offsets = rng.integers(0, (end_date - start_date).days, n)
+    return np.datetime64(start_date, 's') + offsets.astype('timedelta64[D]')
+
+
+def draw_block(c: canvas.Canvas, x: float, y: float, font: str, size: float,
+               lines: Sequence[str], leading: float = 15) -> None:
+    """Draw consecutive same-font lines as a single text object"""
+    c.setFont(font, size)
+    t = c.beginText(x, y)
+    t.setLeading(leading)
+    for line in lines:
+        t.textLine(line)
+    c.drawText(t)
+
+
+# Content streams of the sample PDFs are only a few KB, so deflating them
+# costs more than it saves. Set SAMPLE_PDF_COMPRESSION=1 to re-enable it.
+PAGE_COMPRESSION = int(os.environ.get("SAMPLE_PDF_COMPRESSION", "0"))
@@ -1,9 +1,71 @@
 import pandas as pd
+import numpy as np
 import os
 from typing import Dict, List, Any, Optional, Tuple, Union
 import json
+import warnings
+import importlib.util
 from datetime import datetime
 
+try:
+    from pandas.tseries.api import guess_datetime_format
+except ImportError:  # pandas < 2.2 only exposes it from the private parsing module
+    from pandas._libs.tslibs.parsing import guess_datetime_format
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+# Prefer the streaming xlsxwriter engine over pandas' default openpyxl when it is installed
+_EXCEL_ENGINE = 'xlsxwriter' if importlib.util.find_spec('xlsxwriter') else None
+
+# Store text columns as Arrow strings when pyarrow is installed, otherwise keep object columns
+_STRING_DTYPE = 'string[pyarrow]' if pa is not None else None
+
+
+def _write_json(obj: Any, output_path: str) -> None:
+    """Write obj as indented JSON, using orjson when it is installed"""
+    if orjson is None:
+        with open(output_path, 'w') as f:
+            json.dump(obj, f, indent=4, default=str)
+        return
+        
+    options = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+    with open(output_path, 'wb') as f:
+        f.write(orjson.dumps(obj, option=options, default=str))
+
+
+def _json_line(row: Any) -> bytes:
+    """Encode row as one compact JSON line, using orjson when it is installed"""
+    if orjson is None:
+        return (json.dumps(row, default=str) + '\n').encode()
+        
+    options = orjson.OPT_APPEND_NEWLINE | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+    return orjson.dumps(row, option=options, default=str)
+
+
+def _write_json_lines(rows: List[Dict[str, Any]], output_path: str) -> None:
+    """Write one compact JSON document per line"""
+    with open(output_path, 'wb') as f:
+        f.writelines(_json_line(row) for row in rows)
+
+
+def month_periods(data: pd.DataFrame) -> Optional[pd.Series]:
+    """Return the month period of each row, or None when there are no parsed dates"""
+    if 'date' in data.columns and pd.api.types.is_datetime64_any_dtype(data['date']):
+        return data['date'].dt.to_period('M')
+    return None
+
+
+# Nested fields that a streaming processor writes out and replaces with their length
+_STREAMED_FIELDS = {'line_items': 'line_item_count', 'tables': 'table_count'}
+
 
 class DataProcessor:
     """Process extracted data from PDFs"""
@@ -12,38 +74,77 @@ class DataProcessor:
         """Initialize with list of extracted data dictionaries"""
         self.data_list = data_list or []
         self.processed_data = pd.DataFrame()
+        self._date_format = None
+        self._stream = None
+        
+    def stream_to(self, output_path: str) -> None:
+        """Write every added record to a JSON Lines file and keep only a summary in memory"""
+        self._stream = open(output_path, 'wb')
+        
+    def close_stream(self) -> None:
+        """Close the JSON Lines file opened by stream_to"""
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
         
     def add_data(self, data: Dict[str, Any]) -> None:
         """Add a single data dictionary to the processor"""
-        self.data_list.append(data)
+        if self._stream is None:
+            self.data_list.append(data)
+            return
+            
+        # Stream the full record and keep only what process_*_data needs
+        self._stream.write(_json_line(data))
+        summary = {key: value for key, value in data.items() if key not in _STREAMED_FIELDS}
+        for field, count_key in _STREAMED_FIELDS.items():
+            if field in data:
+                summary[count_key] = len(data[field] or [])
+        self.data_list.append(summary)
         
+    def _parse_dates(self, df: pd.DataFrame) -> None:
+        """Convert the date column in place using one format guessed from the first value"""
+        if 'date' not in df.columns or df['date'].isna().all():
+            return
+            
+        # Guess the format once and reuse it for later batches
+        if self._date_format is None:
+            sample = str(df['date'].dropna().iloc[0])
+            self._date_format = guess_datetime_format(sample)
+            
+        if self._date_format:
+            df['date'] = pd.to_datetime(df['date'], format=self._date_format, errors='coerce', cache=True)
+        else:
+            df['date'] = pd.to_datetime(df['date'], errors='coerce', cache=True)
+            
+    def _convert_text_columns(self, df: pd.DataFrame, columns: List[str]) -> None:
+        """Convert the given text columns in place to the Arrow-backed string dtype when available"""
+        if _STRING_DTYPE is None:
+            return
+            
+        for column in columns:
+            if column in df.columns:
+                df[column] = df[column].astype(_STRING_DTYPE)
+                
     def process_invoice_data(self) -> pd.DataFrame:
         """Process a list of invoice data dictionaries into a structured DataFrame"""
         if not self.data_list:
             return pd.DataFrame()
             
-        # Extract the basic invoice information
-        invoice_info = []
+        # Extract the basic invoice information one column at a time
+        columns = {'invoice_number': [], 'date': [], 'vendor': [], 'total_amount': [], 'line_item_count': []}
         for data in self.data_list:
-            invoice_info.append({
-                'invoice_number': data.get('invoice_number'),
-                'date': data.get('date'),
-                'vendor': data.get('vendor'),
-                'total_amount': data.get('total_amount'),
-                'line_item_count': len(data.get('line_items', []))
-            })
+            columns['invoice_number'].append(data.get('invoice_number'))
+            columns['date'].append(data.get('date'))
+            columns['vendor'].append(data.get('vendor'))
+            columns['total_amount'].append(data.get('total_amount'))
+            columns['line_item_count'].append(data.get('line_item_count', len(data.get('line_items', []) or [])))
             
-        # Create the DataFrame from the invoice info
-        df = pd.DataFrame(invoice_info)
+        # Create the DataFrame from the invoice columns
+        df = pd.DataFrame(columns)
+        self._convert_text_columns(df, ['invoice_number', 'vendor'])
         
         # Convert date strings to datetime objects if they exist
-        if 'date' in df.columns and not df['date'].isna().all():
-            # Try multiple date formats
-            for date_format in ['%m/%d/%Y', '%d/%m/%Y', '%m-%d-%Y', '%d-%m-%Y', '%m.%d.%Y', '%d.%m.%Y']:
-                try:
-                    df['date'] = pd.to_datetime(df['date'], format=date_format, errors='ignore')
-                except:
-                    continue
+        self._parse_dates(df)
                     
         # Set invoice number as index if available
         if 'invoice_number' in df.columns and not df['invoice_number'].isna().all():
@@ -57,36 +158,33 @@ class DataProcessor:
         if not self.data_list:
             return pd.DataFrame()
             
-        # Extract the basic report information
-        report_info = []
+        # Collect every metric column up front, in first-seen order
+        metric_columns = {}
         for data in self.data_list:
-            # Combine data dictionary with key metrics
-            report_dict = {
-                'title': data.get('title'),
-                'date': data.get('date'),
-                'summary': data.get('summary'),
-                'table_count': len(data.get('tables', []))
-            }
-            
-            # Add all key metrics to the dictionary
-            metrics = data.get('key_metrics', {})
-            for key, value in metrics.items():
+            for key in data.get('key_metrics', {}):
                 safe_key = key.replace(' ', '_').lower()
-                report_dict[f'metric_{safe_key}'] = value
+                metric_columns.setdefault(f'metric_{safe_key}', [])
                 
-            report_info.append(report_dict)
+        # Extract the basic report information one column at a time
+        columns = {'title': [], 'date': [], 'summary': [], 'table_count': []}
+        for data in self.data_list:
+            columns['title'].append(data.get('title'))
+            columns['date'].append(data.get('date'))
+            columns['summary'].append(data.get('summary'))
+            columns['table_count'].append(data.get('table_count', len(data.get('tables', []) or [])))
             
+            # Add all key metrics, leaving gaps for metrics this report lacks
+            metrics = {f"metric_{key.replace(' ', '_').lower()}": value
+                       for key, value in data.get('key_metrics', {}).items()}
+            for column, values in metric_columns.items():
+                values.append(metrics.get(column))
+                
         # Create DataFrame
-        df = pd.DataFrame(report_info)
+        df = pd.DataFrame({**columns, **metric_columns})
+        self._convert_text_columns(df, ['title', 'summary'])
         
         # Convert date strings to datetime objects if they exist
-        if 'date' in df.columns and not df['date'].isna().all():
-            # Try multiple date formats
-            for date_format in ['%m/%d/%Y', '%d/%m/%Y', '%m-%d-%Y', '%d-%m-%Y', '%m.%d.%Y', '%d.%m.%Y']:
-                try:
-                    df['date'] = pd.to_datetime(df['date'], format=date_format, errors='ignore')
-                except:
-                    continue
+        self._parse_dates(df)
         
         self.processed_data = df
         return df
@@ -103,12 +201,29 @@ class DataProcessor:
         if self.processed_data.empty:
             raise ValueError("No processed data available. Call process_invoice_data or process_report_data first.")
             
-        self.processed_data.to_excel(output_path, sheet_name='Processed Data')
+        self.processed_data.to_excel(output_path, sheet_name='Processed Data', engine=_EXCEL_ENGINE)
         
-    def export_as_json(self, output_path: str) -> None:
-        """Export original data list as JSON file"""
-        with open(output_path, 'w') as f:
-            json.dump(self.data_list, f, indent=4, default=str)
+    def export_as_json(self, output_path: str, format: str = 'records') -> None:
+        """Export original data list as JSON file, either as records or as a columnar table
+        
+        The 'columnar' format writes the flat fields with orient='split' and moves nested
+        fields (line items, tables, metrics) to a sibling .jsonl file, one line per row.
+        """
+        if format == 'records':
+            _write_json(self.data_list, output_path)
+            return
+        if format != 'columnar':
+            raise ValueError(f"Unknown JSON export format: {format}")
+            
+        df = pd.DataFrame(self.data_list)
+        nested_columns = [col for col in df.columns
+                          if df[col].map(lambda value: isinstance(value, (list, dict, pd.DataFrame))).any()]
+        df.drop(columns=nested_columns).to_json(output_path, orient='split', date_format='iso',
+                                                double_precision=6)
+        
+        if nested_columns:
+            nested_path = os.path.splitext(output_path)[0] + '.jsonl'
+            _write_json_lines(df[nested_columns].to_dict('records'), nested_path)
 
 
 class DataAnalyzer:
@@ -118,6 +233,13 @@ class DataAnalyzer:
         """Initialize with processed DataFrame"""
         self.data = data
         self.insights = {}
+        self._month_periods = None
+        
+    def _months(self) -> Optional[pd.Series]:
+        """Return the month period of each row, computed once, or None when there are no parsed dates"""
+        if self._month_periods is None:
+            self._month_periods = month_periods(self.data)
+        return self._month_periods
         
     def analyze_invoices(self) -> Dict[str, Any]:
         """Analyze invoice data to extract insights"""
@@ -128,26 +250,38 @@ class DataAnalyzer:
         
         # Basic statistics
         if 'total_amount' in self.data.columns:
-            insights['total_spend'] = self.data['total_amount'].sum()
-            insights['average_invoice_amount'] = self.data['total_amount'].mean()
-            insights['max_invoice_amount'] = self.data['total_amount'].max()
-            insights['min_invoice_amount'] = self.data['total_amount'].min()
+            # Reduce the raw float buffer directly, skipping missing amounts like pandas does
+            amounts = self.data['total_amount'].to_numpy(dtype=np.float64, na_value=np.nan)
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', RuntimeWarning)  # All-NaN columns reduce to NaN
+                insights['total_spend'] = float(np.nansum(amounts))
+                insights['average_invoice_amount'] = float(np.nanmean(amounts))
+                insights['max_invoice_amount'] = float(np.nanmax(amounts))
+                insights['min_invoice_amount'] = float(np.nanmin(amounts))
         
         # Vendor analysis
         if 'vendor' in self.data.columns:
-            vendor_counts = self.data['vendor'].value_counts()
-            insights['vendor_count'] = len(vendor_counts)
+            if 'total_amount' in self.data.columns:
+                # Count and total each vendor in one grouping pass; the groups come out sorted by
+                # name and the stable sort keeps that order among tied counts
+                vendor_agg = self.data.groupby('vendor')['total_amount'].agg(['size', 'sum'])
+                vendor_counts = vendor_agg['size'].sort_values(ascending=False, kind='stable')
+                vendor_amounts = vendor_agg['sum']
+            else:
+                vendor_agg = vendor_counts = self.data['vendor'].value_counts()
+                vendor_amounts = None
+                
+            insights['vendor_count'] = len(vendor_agg)
             insights['top_vendors'] = vendor_counts.head(3).to_dict()
             
-            if 'total_amount' in self.data.columns:
-                vendor_amounts = self.data.groupby('vendor')['total_amount'].sum()
+            if vendor_amounts is not None:
                 insights['top_vendors_by_spend'] = vendor_amounts.nlargest(3).to_dict()
         
         # Time series analysis
-        if 'date' in self.data.columns and pd.api.types.is_datetime64_any_dtype(self.data['date']):
+        months = self._months()
+        if months is not None:
             # Monthly analysis
-            self.data['month'] = self.data['date'].dt.to_period('M')
-            monthly_totals = self.data.groupby('month')['total_amount'].sum()
+            monthly_totals = self.data.groupby(months)['total_amount'].sum()
             insights['monthly_totals'] = {str(k): v for k, v in monthly_totals.to_dict().items()}
             
             # Find trends - simple month-over-month change
@@ -165,38 +299,40 @@ class DataAnalyzer:
             
         insights = {}
         
-        # Get metrics columns (those starting with 'metric_')
+        # Get numeric metrics columns (those starting with 'metric_')
         metric_columns = [col for col in self.data.columns if col.startswith('metric_')]
+        numeric_metrics = [col for col in metric_columns if pd.api.types.is_numeric_dtype(self.data[col])]
         
-        # Calculate statistics for each metric
-        for column in metric_columns:
-            # Skip if column has non-numeric data
-            if not pd.api.types.is_numeric_dtype(self.data[column]):
-                continue
-                
+        if not numeric_metrics:
+            self.insights = insights
+            return insights
+            
+        # Calculate basic statistics for every metric in one pass
+        matrix = self.data[numeric_metrics].to_numpy(dtype=np.float64, na_value=np.nan)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)  # All-NaN columns reduce to NaN
+            means = np.nanmean(matrix, axis=0)
+            mins = np.nanmin(matrix, axis=0)
+            maxs = np.nanmax(matrix, axis=0)
+            
+        for column, mean, low, high in zip(numeric_metrics, means.tolist(), mins.tolist(), maxs.tolist()):
             # Get clean metric name without the prefix
             metric_name = column[7:]  # Remove 'metric_' prefix
             
-            # Calculate basic statistics
-            insights[f'{metric_name}_avg'] = self.data[column].mean()
-            insights[f'{metric_name}_min'] = self.data[column].min()
-            insights[f'{metric_name}_max'] = self.data[column].max()
+            insights[f'{metric_name}_avg'] = mean
+            insights[f'{metric_name}_min'] = low
+            insights[f'{metric_name}_max'] = high
             
         # Time series analysis if date is available
-        if 'date' in self.data.columns and pd.api.types.is_datetime64_any_dtype(self.data['date']):
-            # Add period column for grouping
-            self.data['month'] = self.data['date'].dt.to_period('M')
-            
-            # Analyze each metric over time
-            for column in metric_columns:
-                if not pd.api.types.is_numeric_dtype(self.data[column]):
-                    continue
-                    
-                metric_name = column[7:]
-                monthly_avgs = self.data.groupby('month')[column].mean()
-                
-                if len(monthly_avgs) > 1:
-                    insights[f'{metric_name}_trend'] = {
+        months = self._months()
+        if months is not None:
+            # Average every metric per month with a single groupby
+            monthly = self.data.groupby(months)[numeric_metrics].mean()
+            
+            if len(monthly) > 1:
+                for column in numeric_metrics:
+                    monthly_avgs = monthly[column]
+                    insights[f'{column[7:]}_trend'] = {
                         'values': {str(k): v for k, v in monthly_avgs.to_dict().items()},
                         'change': monthly_avgs.iloc[-1] - monthly_avgs.iloc[0],
                         'pct_change': ((monthly_avgs.iloc[-1] / monthly_avgs.iloc[0]) - 1) * 100
@@ -213,36 +349,32 @@ class DataAnalyzer:
             
         anomalies = []
         
-        # Check numeric columns for anomalies
-        numeric_columns = self.data.select_dtypes(include=['number']).columns
+        # Check numeric columns for anomalies, reducing every column in one call
+        numeric_data = self.data.select_dtypes(include=['number'])
+        means = numeric_data.mean().to_numpy(dtype=np.float64, na_value=np.nan)
+        stds = numeric_data.std().to_numpy(dtype=np.float64, na_value=np.nan)
         
-        for column in numeric_columns:
-            # Calculate z-scores
-            mean = self.data[column].mean()
-            std = self.data[column].std()
-            
-            if std == 0:  # Skip if there's no variation
-                continue
-                
-            z_scores = (self.data[column] - mean) / std
-            
-            # Find anomalies where abs(z-score) > threshold
-            anomaly_indices = self.data[abs(z_scores) > threshold].index
-            
-            for idx in anomaly_indices:
-                value = self.data.loc[idx, column]
-                anomalies.append({
-                    'index': idx,
-                    'column': column,
-                    'value': value,
-                    'z_score': z_scores[idx],
-                    'mean': mean,
-                    'std': std
-                })
+        # Score the whole numeric block at once, skipping columns with no variation
+        matrix = numeric_data.to_numpy(dtype=np.float64, na_value=np.nan)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            z_scores = (matrix - means) / stds
+        hits = (np.abs(z_scores) > threshold) & (stds != 0)
+        
+        # Find anomalies where abs(z-score) > threshold, column by column
+        for j in np.flatnonzero(hits.any(axis=0)):
+            mask = hits[:, j]
+            records = pd.DataFrame({
+                'index': self.data.index[mask],
+                'column': numeric_data.columns[j],
+                'value': numeric_data.iloc[:, j].values[mask],
+                'z_score': z_scores[mask, j],
+                'mean': means[j],
+                'std': stds[j]
+            })
+            anomalies.extend(records.to_dict('records'))
                 
         return anomalies
         
     def save_insights(self, output_path: str) -> None:
         """Save insights to a JSON file"""
-        with open(output_path, 'w') as f:
-            json.dump(self.insights, f, indent=4, default=str) 
\ No newline at end of file
+        _write_json(self.insights, output_path) 
\ No newline at end of file
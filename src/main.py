@@ -4,14 +4,126 @@ import argparse
 from typing import Dict, List, Any, Optional, Tuple
 import json
 import glob
+import hashlib
+import functools
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+import pdfplumber
 
+import pdf_extractor
 from pdf_extractor import PDFExtractor, InvoiceExtractor, ReportExtractor
 from data_processor import DataProcessor, DataAnalyzer
 from visualizer import DataVisualizer
 
 
-def process_invoices(input_dir: str, output_dir: str) -> Dict[str, Any]:
+# Extraction results are cached under the output directory, keyed by PDF content
+_CACHE_DIR_NAME = ".extract_cache"
+
+
+def _extractor_version() -> str:
+    """Return a digest of the extraction code, so cached results go stale when it changes"""
+    with open(pdf_extractor.__file__, 'rb') as f:
+        key = hashlib.blake2b(f.read(), digest_size=16)
+    key.update(pdfplumber.__version__.encode())
+    return key.hexdigest()
+
+
+_EXTRACTOR_VERSION = _extractor_version()
+
+
+def _encode_cached(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Return extracted data as plain JSON values, storing table DataFrames as columns and rows"""
+    encoded = {'data': {}, 'tables': {}}
+    for key, value in data.items():
+        if isinstance(value, list) and value and all(isinstance(item, pd.DataFrame) for item in value):
+            encoded['tables'][key] = [{'columns': list(table.columns), 'rows': table.values.tolist()}
+                                      for table in value]
+        else:
+            encoded['data'][key] = value
+    return encoded
+
+
+def _decode_cached(encoded: Dict[str, Any]) -> Dict[str, Any]:
+    """Rebuild the extracted data written by _encode_cached"""
+    data = dict(encoded['data'])
+    for key, tables in encoded['tables'].items():
+        data[key] = [pd.DataFrame(table['rows'], columns=table['columns']) for table in tables]
+    return data
+
+
+def _extract_cached(pdf_file: str, extractor_cls: type, method: str,
+                    cache_dir: Optional[str] = None) -> Dict[str, Any]:
+    """Run an extractor method on a PDF, reusing a cached result for identical file contents"""
+    if cache_dir is None:
+        return getattr(extractor_cls(pdf_file), method)()
+        
+    with open(pdf_file, 'rb') as f:
+        content = f.read()
+        
+    # Interactive form fields can change what the text layer shows, so don't cache those files
+    if b'/AcroForm' in content:
+        return getattr(extractor_cls(pdf_file), method)()
+        
+    key = hashlib.blake2b(content, digest_size=16)
+    key.update(f"{extractor_cls.__name__}.{method}:{_EXTRACTOR_VERSION}".encode())
+    cache_path = os.path.join(cache_dir, f"{key.hexdigest()}.json")
+    
+    # Cached files are plain JSON, so a tampered or damaged one can at worst cause a re-extract
+    try:
+        with open(cache_path, 'r') as f:
+            return _decode_cached(json.load(f))
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        pass
+        
+    data = getattr(extractor_cls(pdf_file), method)()
+    
+    # Write to a temporary name first so parallel workers never read a partial file.
+    # Caching is best-effort: a failed write must not lose the record just extracted
+    temp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(temp_path, 'w') as f:
+            json.dump(_encode_cached(data), f)
+        os.replace(temp_path, cache_path)
+    except (OSError, TypeError, ValueError):
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+    return data
+
+
+def _extract_invoice(pdf_file: str, cache_dir: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Extract one invoice PDF in a worker process, returning None on failure"""
+    try:
+        # Extract data from the PDF
+        invoice_data = _extract_cached(pdf_file, InvoiceExtractor, 'extract_invoice_data', cache_dir)
+        
+        # Add filename to the data
+        invoice_data['filename'] = os.path.basename(pdf_file)
+        return invoice_data
+    except Exception as e:
+        print(f"Error processing {pdf_file}: {str(e)}")
+        return None
+
+
+def _extract_report(pdf_file: str, cache_dir: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Extract one report PDF in a worker process, returning None on failure"""
+    try:
+        # Extract data from the PDF
+        report_data = _extract_cached(pdf_file, ReportExtractor, 'extract_report_data', cache_dir)
+        
+        # Add filename to the data
+        report_data['filename'] = os.path.basename(pdf_file)
+        return report_data
+    except Exception as e:
+        print(f"Error processing {pdf_file}: {str(e)}")
+        return None
+
+
+def process_invoices(input_dir: str, output_dir: str, use_cache: bool = True,
+                   stream: bool = False) -> Dict[str, Any]:
     """Process all invoice PDFs in the input directory"""
     # Find all PDF files in the input directory
     pdf_files = glob.glob(os.path.join(input_dir, "*.pdf"))
@@ -19,23 +131,25 @@ def process_invoices(input_dir: str, output_dir: str) -> Dict[str, Any]:
         print(f"No PDF files found in {input_dir}")
         return {}
         
-    # Process each PDF
+    # Extract the PDFs in parallel, results come back in file order
     processor = DataProcessor()
-    for pdf_file in pdf_files:
-        print(f"Processing invoice: {os.path.basename(pdf_file)}")
-        try:
-            # Extract data from the PDF
-            extractor = InvoiceExtractor(pdf_file)
-            invoice_data = extractor.extract_invoice_data()
-            
-            # Add filename to the data
-            invoice_data['filename'] = os.path.basename(pdf_file)
-            
-            # Add the data to the processor
-            processor.add_data(invoice_data)
-        except Exception as e:
-            print(f"Error processing {pdf_file}: {str(e)}")
-            continue
+    if stream:
+        # Write raw records as they arrive instead of holding them all for export
+        os.makedirs(output_dir, exist_ok=True)
+        output_json = os.path.join(output_dir, "raw_invoice_data.jsonl")
+        processor.stream_to(output_json)
+        
+    cache_dir = os.path.join(output_dir, _CACHE_DIR_NAME) if use_cache else None
+    extract = functools.partial(_extract_invoice, cache_dir=cache_dir)
+    try:
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            for pdf_file, invoice_data in zip(pdf_files, executor.map(extract, pdf_files, chunksize=4)):
+                print(f"Processing invoice: {os.path.basename(pdf_file)}")
+                if invoice_data is not None:
+                    # Add the data to the processor
+                    processor.add_data(invoice_data)
+    finally:
+        processor.close_stream()
     
     # Process the combined data
     df = processor.process_invoice_data()
@@ -49,11 +163,12 @@ def process_invoices(input_dir: str, output_dir: str) -> Dict[str, Any]:
     # Save the processed data
     output_csv = os.path.join(output_dir, "processed_invoices.csv")
     output_excel = os.path.join(output_dir, "processed_invoices.xlsx")
-    output_json = os.path.join(output_dir, "raw_invoice_data.json")
     
     processor.save_to_csv(output_csv)
     processor.save_to_excel(output_excel)
-    processor.export_as_json(output_json)
+    if not stream:
+        output_json = os.path.join(output_dir, "raw_invoice_data.json")
+        processor.export_as_json(output_json)
     
     print(f"Processed data saved to {output_csv} and {output_excel}")
     print(f"Raw extracted data saved to {output_json}")
@@ -91,7 +206,8 @@ def process_invoices(input_dir: str, output_dir: str) -> Dict[str, Any]:
     }
 
 
-def process_reports(input_dir: str, output_dir: str) -> Dict[str, Any]:
+def process_reports(input_dir: str, output_dir: str, use_cache: bool = True,
+                   stream: bool = False) -> Dict[str, Any]:
     """Process all report PDFs in the input directory"""
     # Find all PDF files in the input directory
     pdf_files = glob.glob(os.path.join(input_dir, "*.pdf"))
@@ -99,23 +215,25 @@ def process_reports(input_dir: str, output_dir: str) -> Dict[str, Any]:
         print(f"No PDF files found in {input_dir}")
         return {}
         
-    # Process each PDF
+    # Extract the PDFs in parallel, results come back in file order
     processor = DataProcessor()
-    for pdf_file in pdf_files:
-        print(f"Processing report: {os.path.basename(pdf_file)}")
-        try:
-            # Extract data from the PDF
-            extractor = ReportExtractor(pdf_file)
-            report_data = extractor.extract_report_data()
-            
-            # Add filename to the data
-            report_data['filename'] = os.path.basename(pdf_file)
-            
-            # Add the data to the processor
-            processor.add_data(report_data)
-        except Exception as e:
-            print(f"Error processing {pdf_file}: {str(e)}")
-            continue
+    if stream:
+        # Write raw records as they arrive instead of holding them all for export
+        os.makedirs(output_dir, exist_ok=True)
+        output_json = os.path.join(output_dir, "raw_report_data.jsonl")
+        processor.stream_to(output_json)
+        
+    cache_dir = os.path.join(output_dir, _CACHE_DIR_NAME) if use_cache else None
+    extract = functools.partial(_extract_report, cache_dir=cache_dir)
+    try:
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            for pdf_file, report_data in zip(pdf_files, executor.map(extract, pdf_files, chunksize=4)):
+                print(f"Processing report: {os.path.basename(pdf_file)}")
+                if report_data is not None:
+                    # Add the data to the processor
+                    processor.add_data(report_data)
+    finally:
+        processor.close_stream()
     
     # Process the combined data
     df = processor.process_report_data()
@@ -129,11 +247,12 @@ def process_reports(input_dir: str, output_dir: str) -> Dict[str, Any]:
     # Save the processed data
     output_csv = os.path.join(output_dir, "processed_reports.csv")
     output_excel = os.path.join(output_dir, "processed_reports.xlsx")
-    output_json = os.path.join(output_dir, "raw_report_data.json")
     
     processor.save_to_csv(output_csv)
     processor.save_to_excel(output_excel)
-    processor.export_as_json(output_json)
+    if not stream:
+        output_json = os.path.join(output_dir, "raw_report_data.json")
+        processor.export_as_json(output_json)
     
     print(f"Processed data saved to {output_csv} and {output_excel}")
     print(f"Raw extracted data saved to {output_json}")
@@ -178,6 +297,10 @@ def main():
                       help='Type of PDFs to process (invoice or report)')
     parser.add_argument('--input', required=True, help='Input directory containing PDFs')
     parser.add_argument('--output', default='./output', help='Output directory for results')
+    parser.add_argument('--no-cache', action='store_true',
+                      help='Re-extract every PDF instead of reusing cached results')
+    parser.add_argument('--stream', action='store_true',
+                      help='Stream raw extracted data to a JSON Lines file instead of keeping it in memory')
     
     args = parser.parse_args()
     
@@ -186,9 +309,9 @@ def main():
         return 1
         
     if args.type == 'invoice':
-        process_invoices(args.input, args.output)
+        process_invoices(args.input, args.output, use_cache=not args.no_cache, stream=args.stream)
     else:
-        process_reports(args.input, args.output)
+        process_reports(args.input, args.output, use_cache=not args.no_cache, stream=args.stream)
         
     return 0
 
@@ -4,6 +4,17 @@ import os
 import re
 from typing import Dict, List, Any, Optional, Tuple
 
+# Patterns used by the specialized extractors, compiled once per process
+_INVOICE_NUM_RE = re.compile(r'Invoice\s*#?:?\s*([A-Z0-9\-]+)', re.IGNORECASE)
+_DATE_RE = re.compile(r'Date:?\s*(\d{1,2}[\/\-\.]\d{1,2}[\/\-\.]\d{2,4})', re.IGNORECASE)
+_AMOUNT_RE = re.compile(r'Total:?\s*\$?(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)|\$(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)', re.IGNORECASE)
+_METRIC_RE = re.compile(r'([A-Za-z\s]+):\s*\$?(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)')
+_SUMMARY_RE = re.compile(r'(?:Summary|Abstract|Executive\s+Summary):(.*?)(?=\n\n|\n[A-Z]|\Z)',
+                         re.DOTALL | re.IGNORECASE)
+
+# A table as returned by pdfplumber: header row and body rows, cells may be None
+RawTable = Tuple[List[Optional[str]], List[List[Optional[str]]]]
+
 
 class PDFExtractor:
     """Base class for PDF data extraction"""
@@ -12,6 +23,7 @@ class PDFExtractor:
         """Initialize with path to PDF file"""
         self.pdf_path = pdf_path
         self._validate_file()
+        self._cached: Optional[Tuple[List[str], List[RawTable]]] = None
         
     def _validate_file(self) -> None:
         """Validate the PDF file exists and is accessible"""
@@ -20,28 +32,34 @@ class PDFExtractor:
         if not self.pdf_path.lower().endswith('.pdf'):
             raise ValueError(f"File is not a PDF: {self.pdf_path}")
     
+    def _extract_all(self) -> Tuple[List[str], List[RawTable]]:
+        """Open the PDF once and extract text and raw tables in a single pass over the pages"""
+        if self._cached is None:
+            pages = []
+            tables = []
+            with pdfplumber.open(self.pdf_path) as pdf:
+                for page in pdf.pages:
+                    text = page.extract_text()
+                    if text:
+                        pages.append(text)
+                    for table in page.extract_tables():
+                        if table:
+                            # Keep the header row apart from the body rows
+                            tables.append((table[0], table[1:]))
+            self._cached = (pages, tables)
+        return self._cached
+    
     def extract_text(self) -> List[str]:
         """Extract all text from the PDF as a list of pages"""
-        pages = []
-        with pdfplumber.open(self.pdf_path) as pdf:
-            for page in pdf.pages:
-                text = page.extract_text()
-                if text:
-                    pages.append(text)
-        return pages
+        return list(self._extract_all()[0])
+    
+    def extract_tables_raw(self) -> List[RawTable]:
+        """Extract all tables from the PDF as (header, rows) pairs without building DataFrames"""
+        return list(self._extract_all()[1])
     
     def extract_tables(self) -> List[pd.DataFrame]:
         """Extract all tables from the PDF"""
-        tables = []
-        with pdfplumber.open(self.pdf_path) as pdf:
-            for page in pdf.pages:
-                extracted_tables = page.extract_tables()
-                for table in extracted_tables:
-                    if table:
-                        # Convert the table to a DataFrame
-                        df = pd.DataFrame(table[1:], columns=table[0])
-                        tables.append(df)
-        return tables
+        return [pd.DataFrame(rows, columns=header) for header, rows in self.extract_tables_raw()]
 
 
 class InvoiceExtractor(PDFExtractor):
@@ -49,7 +67,7 @@ class InvoiceExtractor(PDFExtractor):
     
     def extract_invoice_data(self) -> Dict[str, Any]:
         """Extract key data from invoice"""
-        pages = self.extract_text()
+        pages, raw_tables = self._extract_all()
         
         # Initialize result dictionary
         invoice_data = {
@@ -67,17 +85,17 @@ class InvoiceExtractor(PDFExtractor):
         text = pages[0]
         
         # Extract invoice number (format varies by vendor)
-        invoice_match = re.search(r'Invoice\s*#?:?\s*([A-Z0-9\-]+)', text, re.IGNORECASE)
+        invoice_match = _INVOICE_NUM_RE.search(text)
         if invoice_match:
             invoice_data["invoice_number"] = invoice_match.group(1).strip()
             
         # Extract date (multiple formats)
-        date_match = re.search(r'Date:?\s*(\d{1,2}[\/\-\.]\d{1,2}[\/\-\.]\d{2,4})', text, re.IGNORECASE)
+        date_match = _DATE_RE.search(text)
         if date_match:
             invoice_data["date"] = date_match.group(1)
             
         # Extract total amount
-        amount_match = re.search(r'Total:?\s*\$?(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)|\$(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)', text, re.IGNORECASE)
+        amount_match = _AMOUNT_RE.search(text)
         if amount_match:
             amount = amount_match.group(1) or amount_match.group(2)
             if amount:
@@ -91,17 +109,16 @@ class InvoiceExtractor(PDFExtractor):
             invoice_data["vendor"] = lines[0].strip()
             
         # Extract line items from tables
-        tables = self.extract_tables()
-        if tables:
-            for table in tables:
-                # Look for tables that might contain line items
-                price_columns = [col for col in table.columns if any(keyword in col.lower() 
-                                for keyword in ['price', 'amount', 'total', 'cost'])]
-                if price_columns:
-                    # Convert table to line items
-                    for _, row in table.iterrows():
-                        item = {col: row[col] for col in table.columns}
-                        invoice_data["line_items"].append(item)
+        for header, rows in raw_tables:
+            # Look for tables that might contain line items before building a DataFrame
+            price_columns = [col for col in header if any(keyword in (col or '').lower()
+                            for keyword in ['price', 'amount', 'total', 'cost'])]
+            if price_columns:
+                # Convert table to line items, keeping the first of any repeated headers
+                table = pd.DataFrame(rows, columns=header)
+                if table.columns.has_duplicates:
+                    table = table.loc[:, ~table.columns.duplicated()]
+                invoice_data["line_items"].extend(table.to_dict(orient="records"))
         
         return invoice_data
 
@@ -133,12 +150,12 @@ class ReportExtractor(PDFExtractor):
             report_data["title"] = lines[0].strip()
             
         # Look for date
-        date_match = re.search(r'Date:?\s*(\d{1,2}[\/\-\.]\d{1,2}[\/\-\.]\d{2,4})', text, re.IGNORECASE)
+        date_match = _DATE_RE.search(text)
         if date_match:
             report_data["date"] = date_match.group(1)
             
         # Extract key metrics (numbers with labels)
-        metric_matches = re.finditer(r'([A-Za-z\s]+):\s*\$?(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)', text)
+        metric_matches = _METRIC_RE.finditer(text)
         for match in metric_matches:
             key = match.group(1).strip()
             value = match.group(2).replace(',', '')
@@ -148,8 +165,7 @@ class ReportExtractor(PDFExtractor):
                 report_data["key_metrics"][key] = value
                 
         # Extract summary (usually found after title and before first heading)
-        summary_match = re.search(r'(?:Summary|Abstract|Executive\s+Summary):(.*?)(?=\n\n|\n[A-Z]|\Z)', 
-                                  text, re.DOTALL | re.IGNORECASE)
+        summary_match = _SUMMARY_RE.search(text)
         if summary_match:
             report_data["summary"] = summary_match.group(1).strip()
             
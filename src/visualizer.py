@@ -1,11 +1,48 @@
-import matplotlib.pyplot as plt
+import matplotlib
 import pandas as pd
 import os
 from typing import Dict, List, Any, Optional, Tuple, Union
 import json
 from matplotlib.figure import Figure
 from matplotlib.axes import Axes
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 import numpy as np
+from PIL import Image
+
+from data_processor import month_periods
+
+
+def _linear_trend(y: np.ndarray) -> np.ndarray:
+    """Return the least-squares line through y at x = 0..n-1, using the closed-form slope"""
+    x = np.arange(len(y), dtype=np.float64)
+    x_centered = x - x.mean()
+    slope = (x_centered * (y - y.mean())).sum() / (x_centered ** 2).sum()
+    return y.mean() + slope * x_centered
+
+
+def _downsample(y: np.ndarray, n_out: int = 2000) -> Tuple[np.ndarray, np.ndarray]:
+    """Reduce y to the min and max of n_out // 2 equal bins, returning x and y arrays for a line plot"""
+    edges = np.linspace(0, len(y), n_out // 2 + 1).astype(np.intp)
+    starts = edges[:-1]
+    # fmin/fmax skip NaNs, so a bin is only NaN (a gap in the line) when all of it is missing
+    y_out = np.column_stack([np.fmin.reduceat(y, starts), np.fmax.reduceat(y, starts)]).ravel()
+    x_out = np.repeat((starts + edges[1:] - 1) / 2, 2)
+    return x_out, y_out
+
+
+def _save_png(fig: Figure, output_path: str) -> None:
+    """Render fig on its own Agg canvas and write it with Pillow at a fast zlib compression level"""
+    canvas = FigureCanvasAgg(fig)
+    canvas.draw()
+    image = Image.fromarray(np.asarray(canvas.buffer_rgba()))
+    image.save(output_path, format='PNG', compress_level=1, dpi=(fig.dpi, fig.dpi))
+
+
+def _anomaly_frame(anomalies: Union[List[Dict[str, Any]], pd.DataFrame]) -> pd.DataFrame:
+    """Return anomaly records as one DataFrame, with a categorical column name and float values"""
+    if isinstance(anomalies, pd.DataFrame):
+        return anomalies
+    return pd.DataFrame(anomalies).astype({'column': 'category', 'value': 'float64'})
 
 
 class DataVisualizer:
@@ -13,70 +50,161 @@ class DataVisualizer:
     
     def __init__(self, data: pd.DataFrame, insights: Dict[str, Any] = None):
         """Initialize with processed DataFrame and optional insights dictionary"""
+        self._fig_cache: Dict[str, Figure] = {}
+        self._reuse_figures = False
         self.data = data
         self.insights = insights or {}
+        self._anomalies = None
+        self._anomalies_source = None
+        
+    @property
+    def data(self) -> pd.DataFrame:
+        """The DataFrame being charted"""
+        return self._data
+        
+    @data.setter
+    def data(self, data: pd.DataFrame) -> None:
+        """Replace the charted data and drop everything derived from the previous frame"""
+        self._data = data
+        self._month_periods = None
+        self._monthly_means: Dict[Tuple[str, ...], pd.DataFrame] = {}
+        self._anomaly_artists: Dict[str, Dict[str, Any]] = {}
+        self._anomaly_axes = None
+        
+    def _subplots(self, kind: str, nrows: int = 1, ncols: int = 1,
+                  figsize: Optional[Tuple[float, float]] = None) -> Tuple[Figure, Any]:
+        """Return a figure with a fresh grid of axes, reusing this chart kind's figure inside save_visualizations"""
+        if not self._reuse_figures:
+            # Public chart calls hand back pyplot figures so plt.show() and fig.show() keep working
+            import matplotlib.pyplot as plt
+            fig = plt.figure(figsize=figsize)
+            return fig, fig.subplots(nrows, ncols)
+
+        fig = self._fig_cache.get(kind)
+        if fig is None:
+            # Created outside pyplot so the figures are not tracked or closed by it
+            fig = Figure()
+            self._fig_cache[kind] = fig
+        else:
+            # Drop the artists and the margins tight_layout left on the previous chart
+            fig.clear()
+            fig.subplots_adjust(**{key: matplotlib.rcParams[f'figure.subplot.{key}']
+                                   for key in ('left', 'bottom', 'right', 'top', 'wspace', 'hspace')})
+        fig.set_size_inches(figsize or matplotlib.rcParams['figure.figsize'])
+        return fig, fig.subplots(nrows, ncols)
+        
+    def _anomaly_records(self) -> Optional[pd.DataFrame]:
+        """Return insights['anomalies'] as a DataFrame, converting it again only when the records change"""
+        anomalies = self.insights.get('anomalies')
+        if anomalies is None or len(anomalies) == 0:
+            return None
+        source = (id(anomalies), len(anomalies))
+        if source != self._anomalies_source:
+            self._anomalies = _anomaly_frame(anomalies)
+            self._anomalies_source = source
+        return self._anomalies
+        
+    def _months(self) -> Optional[pd.Series]:
+        """Return the month period of each row, computed once, or None when there are no parsed dates"""
+        if self._month_periods is None:
+            self._month_periods = month_periods(self.data)
+        return self._month_periods
+        
+    def _monthly_metric_means(self, metrics: Tuple[str, ...]) -> pd.DataFrame:
+        """Return the monthly means of the given metrics indexed by month string, computed once per data"""
+        if metrics not in self._monthly_means:
+            monthly_means = self.data.groupby(self._months())[list(metrics)].mean()
+            monthly_means.index = monthly_means.index.astype(str)
+            self._monthly_means[metrics] = monthly_means
+        return self._monthly_means[metrics]
         
     def create_invoice_summary_chart(self) -> Tuple[Figure, Axes]:
-        """Create a summary chart for invoice data"""
+        """Create a summary chart for invoice data on a new figure"""
         if self.data.empty:
-            fig, ax = plt.subplots()
+            fig, ax = self._subplots('invoice')
             ax.text(0.5, 0.5, "No data available", ha='center', va='center')
             return fig, ax
             
+        # Note which columns hold any values, so plots over all-missing columns are skipped up front
+        columns = self.data.columns
+        has = {
+            'date': ('date' in columns and pd.api.types.is_datetime64_any_dtype(self.data['date'])
+                     and self.data['date'].notna().any()),
+            'vendor': 'vendor' in columns and self.data['vendor'].notna().any(),
+            'total_amount': 'total_amount' in columns and self.data['total_amount'].notna().any()
+        }
+        
+        # Convert the amount column to a float array once for the plots that read it directly
+        cols = {}
+        if has['total_amount']:
+            cols['total_amount'] = self.data['total_amount'].to_numpy(dtype=np.float64, na_value=np.nan)
+            
         # Create a figure with subplots
-        fig, axs = plt.subplots(2, 2, figsize=(12, 10))
+        fig, axs = self._subplots('invoice', 2, 2, figsize=(12, 10))
         
         # Plot 1: Monthly totals if available
-        if 'date' in self.data.columns and pd.api.types.is_datetime64_any_dtype(self.data['date']):
-            if not self.data.groupby(self.data['date'].dt.to_period('M'))['total_amount'].sum().empty:
-                monthly_data = self.data.groupby(self.data['date'].dt.to_period('M'))['total_amount'].sum()
+        if has['date']:
+            monthly_data = self.data.groupby(self._months())['total_amount'].sum()
+            if not monthly_data.empty:
                 monthly_data.index = monthly_data.index.astype(str)
                 axs[0, 0].bar(monthly_data.index, monthly_data.values)
                 axs[0, 0].set_title('Monthly Invoice Totals')
                 axs[0, 0].set_xlabel('Month')
                 axs[0, 0].set_ylabel('Total Amount')
-                plt.setp(axs[0, 0].xaxis.get_majorticklabels(), rotation=45)
+                axs[0, 0].tick_params(axis='x', labelrotation=45)
         else:
             axs[0, 0].text(0.5, 0.5, "No date data available", ha='center', va='center')
             
+        # Count and total every vendor in one grouping pass for plots 2 and 3, with the groups
+        # sorted by name so tied vendors are ranked the same way as in the invoice insights
+        vendor_agg = None
+        if has['vendor'] and has['total_amount']:
+            vendor_agg = self.data.groupby('vendor')['total_amount'].agg(['size', 'sum'])
+            
         # Plot 2: Top vendors by count
-        if 'vendor' in self.data.columns:
-            vendor_counts = self.data['vendor'].value_counts().head(5)
+        if has['vendor']:
+            if vendor_agg is not None:
+                vendor_counts = vendor_agg['size'].sort_values(ascending=False, kind='stable').head(5)
+            else:
+                vendor_counts = self.data['vendor'].value_counts().head(5)
             axs[0, 1].bar(vendor_counts.index, vendor_counts.values)
             axs[0, 1].set_title('Top Vendors by Invoice Count')
             axs[0, 1].set_xlabel('Vendor')
             axs[0, 1].set_ylabel('Count')
-            plt.setp(axs[0, 1].xaxis.get_majorticklabels(), rotation=45)
+            axs[0, 1].tick_params(axis='x', labelrotation=45)
         else:
             axs[0, 1].text(0.5, 0.5, "No vendor data available", ha='center', va='center')
             
         # Plot 3: Top vendors by total amount
-        if 'vendor' in self.data.columns and 'total_amount' in self.data.columns:
-            vendor_amounts = self.data.groupby('vendor')['total_amount'].sum().nlargest(5)
+        if vendor_agg is not None:
+            vendor_amounts = vendor_agg['sum'].nlargest(5)
             axs[1, 0].bar(vendor_amounts.index, vendor_amounts.values)
             axs[1, 0].set_title('Top Vendors by Spend')
             axs[1, 0].set_xlabel('Vendor')
             axs[1, 0].set_ylabel('Total Amount')
-            plt.setp(axs[1, 0].xaxis.get_majorticklabels(), rotation=45)
+            axs[1, 0].tick_params(axis='x', labelrotation=45)
         else:
             axs[1, 0].text(0.5, 0.5, "No vendor amount data available", ha='center', va='center')
             
         # Plot a histogram of invoice amounts
-        if 'total_amount' in self.data.columns:
-            axs[1, 1].hist(self.data['total_amount'].dropna(), bins=10)
+        if has['total_amount']:
+            # Bin a masked view of the amounts rather than a NaN-free copy of the Series
+            amounts = cols['total_amount']
+            counts, edges = np.histogram(amounts[np.isfinite(amounts)], bins=10)
+            axs[1, 1].bar(edges[:-1], counts, width=np.diff(edges), align='edge')
             axs[1, 1].set_title('Invoice Amount Distribution')
             axs[1, 1].set_xlabel('Amount')
             axs[1, 1].set_ylabel('Frequency')
         else:
             axs[1, 1].text(0.5, 0.5, "No amount data available", ha='center', va='center')
             
-        plt.tight_layout()
+        fig.tight_layout()
         return fig, axs
         
     def create_report_summary_chart(self) -> Tuple[Figure, Axes]:
-        """Create a summary chart for report data"""
+        """Create a summary chart for report data on a new figure"""
         if self.data.empty:
-            fig, ax = plt.subplots()
+            fig, ax = self._subplots('report')
             ax.text(0.5, 0.5, "No data available", ha='center', va='center')
             return fig, ax
             
@@ -86,40 +214,39 @@ class DataVisualizer:
                           if pd.api.types.is_numeric_dtype(self.data[col])]
         
         if not numeric_metrics:
-            fig, ax = plt.subplots()
+            fig, ax = self._subplots('report')
             ax.text(0.5, 0.5, "No numeric metrics available", ha='center', va='center')
             return fig, ax
             
         # Create a figure with subplots based on number of metrics (up to 4)
         num_metrics = min(len(numeric_metrics), 4)
-        fig, axs = plt.subplots(2, 2, figsize=(12, 10))
+        fig, axs = self._subplots('report', 2, 2, figsize=(12, 10))
         axs = axs.flatten()
         
         # Plot time series for each metric if date is available
-        if 'date' in self.data.columns and pd.api.types.is_datetime64_any_dtype(self.data['date']):
-            for i, column in enumerate(numeric_metrics[:4]):  # Limit to first 4 metrics
+        if self._months() is not None:
+            # Group by month and calculate the mean of the first 4 metrics in one pass, reused across calls
+            monthly_means = self._monthly_metric_means(tuple(numeric_metrics[:4]))
+            
+            for i, column in enumerate(monthly_means.columns):
                 metric_name = column[7:]  # Remove 'metric_' prefix
-                
-                # Group by month and calculate mean
-                monthly_data = self.data.groupby(self.data['date'].dt.to_period('M'))[column].mean()
-                monthly_data.index = monthly_data.index.astype(str)
+                monthly_data = monthly_means[column]
                 
                 axs[i].plot(monthly_data.index, monthly_data.values, marker='o')
                 axs[i].set_title(f'{metric_name.replace("_", " ").title()} Over Time')
                 axs[i].set_xlabel('Month')
                 axs[i].set_ylabel(metric_name.replace('_', ' ').title())
-                plt.setp(axs[i].xaxis.get_majorticklabels(), rotation=45)
+                axs[i].tick_params(axis='x', labelrotation=45)
                 
                 # Add trend line
                 if len(monthly_data) > 1:
-                    z = np.polyfit(range(len(monthly_data)), monthly_data.values, 1)
-                    p = np.poly1d(z)
-                    axs[i].plot(monthly_data.index, p(range(len(monthly_data))), "r--", alpha=0.8)
+                    axs[i].plot(monthly_data.index, _linear_trend(monthly_data.values), "r--", alpha=0.8)
         else:
             # If no date, just show box plots of the metrics
             for i, column in enumerate(numeric_metrics[:4]):
                 metric_name = column[7:]  # Remove 'metric_' prefix
-                axs[i].boxplot(self.data[column].dropna())
+                values = self.data[column].to_numpy(dtype=np.float64, na_value=np.nan)
+                axs[i].boxplot(values[np.isfinite(values)])
                 axs[i].set_title(f'{metric_name.replace("_", " ").title()} Distribution')
                 axs[i].set_ylabel(metric_name.replace('_', ' ').title())
                 
@@ -127,59 +254,100 @@ class DataVisualizer:
         for i in range(num_metrics, 4):
             axs[i].axis('off')
             
-        plt.tight_layout()
+        fig.tight_layout()
         return fig, axs
         
-    def create_anomaly_chart(self, anomalies: List[Dict[str, Any]]) -> Tuple[Figure, Axes]:
-        """Create a chart highlighting anomalies in the data"""
-        if self.data.empty or not anomalies:
-            fig, ax = plt.subplots()
+    def _anomaly_points(self, column_anomalies: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the row positions and values of one column's anomalies"""
+        # Look up all the row positions in one call
+        anomaly_keys = column_anomalies['index'].to_numpy(dtype=object)
+        if self.data.index.is_unique:
+            anomaly_indices = self.data.index.get_indexer(anomaly_keys)
+            missing = anomaly_indices == -1
+            anomaly_indices[missing] = [int(key) for key in anomaly_keys[missing]]
+        else:
+            # get_loc gives a slice or mask for repeated labels, so take the first matching row instead
+            anomaly_indices = np.array([np.flatnonzero(self.data.index == key)[0] if key in self.data.index
+                                        else int(key) for key in anomaly_keys], dtype=np.intp)
+        anomaly_values = column_anomalies['value'].to_numpy(dtype=np.float64)
+        return anomaly_indices, anomaly_values
+        
+    def create_anomaly_chart(self, anomalies: Union[List[Dict[str, Any]], pd.DataFrame]) -> Tuple[Figure, Axes]:
+        """Create a chart highlighting anomalies in the data on a new figure"""
+        if self.data.empty or len(anomalies) == 0:
+            self._anomaly_artists = {}
+            fig, ax = self._subplots('anomalies')
             ax.text(0.5, 0.5, "No anomalies detected", ha='center', va='center')
             return fig, ax
             
-        # Group anomalies by column
-        anomaly_columns = {}
-        for anomaly in anomalies:
-            column = anomaly['column']
-            if column not in anomaly_columns:
-                anomaly_columns[column] = []
-            anomaly_columns[column].append(anomaly)
+        # Partition the anomalies by column in one groupby, keeping first-seen column order
+        anomaly_columns = dict(tuple(_anomaly_frame(anomalies).groupby('column', sort=False, observed=True)))
+            
+        # Convert each charted column to a float array once and reuse it below
+        cols = {column: self.data[column].to_numpy(dtype=np.float64, na_value=np.nan)
+                for column in anomaly_columns}
+        
+        # Take the mean and std get_anomalies stored with each record, or compute them
+        stats = {}
+        for column, column_anomalies in anomaly_columns.items():
+            first = column_anomalies.iloc[0]
+            if pd.notna(first.get('mean')) and pd.notna(first.get('std')):
+                stats[column] = (first['mean'], first['std'])
+            else:
+                stats[column] = (np.nanmean(cols[column]), np.nanstd(cols[column], ddof=1))
+                
+        # When the same columns and bands were drawn last time, keep the base lines and bands
+        # and only move the anomaly markers
+        if (self._reuse_figures and list(anomaly_columns) == list(self._anomaly_artists)
+                and all(self._anomaly_artists[column]['stats'] == stats[column] for column in stats)):
+            for column, column_anomalies in anomaly_columns.items():
+                points = np.column_stack(self._anomaly_points(column_anomalies))
+                self._anomaly_artists[column]['scatter'].set_offsets(points)
+            return self._fig_cache['anomalies'], self._anomaly_axes
             
         # Create a figure with subplots based on number of columns
         num_columns = len(anomaly_columns)
-        fig, axs = plt.subplots(num_columns, 1, figsize=(10, 4 * num_columns))
+        fig, axs = self._subplots('anomalies', num_columns, 1, figsize=(10, 4 * num_columns))
+        self._anomaly_artists = {}
+        artists = {}
         
         # Handle the case of a single subplot
         if num_columns == 1:
             axs = [axs]
             
         for i, (column, column_anomalies) in enumerate(anomaly_columns.items()):
-            # Plot the full data
-            axs[i].plot(range(len(self.data)), self.data[column], 'b-', label='Data')
+            # Plot the full data against its row position (matplotlib supplies the x values),
+            # rasterized so vector outputs embed the long series as an image. Long series are
+            # reduced to per-bin min/max first, which draws the same envelope with far fewer segments
+            if len(cols[column]) > 4000:
+                base_line, = axs[i].plot(*_downsample(cols[column]), 'b-', label='Data')
+            else:
+                base_line, = axs[i].plot(cols[column], 'b-', label='Data')
+            base_line.set_rasterized(True)
             
             # Highlight anomalies
-            anomaly_indices = [self.data.index.get_loc(a['index']) if a['index'] in self.data.index 
-                             else int(a['index']) for a in column_anomalies]
-            anomaly_values = [a['value'] for a in column_anomalies]
-            
-            axs[i].scatter(anomaly_indices, anomaly_values, color='red', 
-                          s=100, label='Anomalies')
+            anomaly_indices, anomaly_values = self._anomaly_points(column_anomalies)
+            scatter = axs[i].scatter(anomaly_indices, anomaly_values, color='red', 
+                                     s=100, label='Anomalies')
             
             # Add mean line
-            mean = self.data[column].mean()
+            mean, std = stats[column]
             axs[i].axhline(y=mean, color='g', linestyle='-', alpha=0.3, label='Mean')
             
-            # Add standard deviation bands
-            std = self.data[column].std()
-            axs[i].axhline(y=mean + 2*std, color='y', linestyle='--', alpha=0.3, label='+2σ')
-            axs[i].axhline(y=mean - 2*std, color='y', linestyle='--', alpha=0.3)
+            # Add both standard deviation bands as one line collection spanning the axes width
+            axs[i].hlines([mean + 2*std, mean - 2*std], 0, 1, transform=axs[i].get_yaxis_transform(),
+                          colors='y', linestyles='--', alpha=0.3, label='+2σ')
             
             axs[i].set_title(f'Anomalies in {column}')
             axs[i].set_xlabel('Data Point')
             axs[i].set_ylabel(column)
             axs[i].legend()
             
-        plt.tight_layout()
+            artists[column] = {'scatter': scatter, 'stats': stats[column]}
+            
+        fig.tight_layout()
+        if self._reuse_figures:
+            self._anomaly_artists, self._anomaly_axes = artists, axs
         return fig, axs
         
     def save_visualizations(self, output_dir: str, prefix: str = "chart") -> List[str]:
@@ -187,31 +355,34 @@ class DataVisualizer:
         os.makedirs(output_dir, exist_ok=True)
         saved_files = []
         
-        # Determine which chart to create based on available data columns
-        if 'vendor' in self.data.columns or 'total_amount' in self.data.columns:
-            # Invoice data
-            fig, _ = self.create_invoice_summary_chart()
-            output_path = os.path.join(output_dir, f"{prefix}_invoice_summary.png")
-            fig.savefig(output_path)
-            plt.close(fig)
-            saved_files.append(output_path)
-            
-        # Check for metric columns
-        metric_columns = [col for col in self.data.columns if col.startswith('metric_')]
-        if metric_columns:
-            # Report data
-            fig, _ = self.create_report_summary_chart()
-            output_path = os.path.join(output_dir, f"{prefix}_report_summary.png")
-            fig.savefig(output_path)
-            plt.close(fig)
-            saved_files.append(output_path)
-            
-        # Create anomaly chart if insights contain anomalies
-        if 'anomalies' in self.insights and self.insights['anomalies']:
-            fig, _ = self.create_anomaly_chart(self.insights['anomalies'])
-            output_path = os.path.join(output_dir, f"{prefix}_anomalies.png")
-            fig.savefig(output_path)
-            plt.close(fig)
-            saved_files.append(output_path)
+        # The figures are private to this method, so each chart kind redraws the same one
+        self._reuse_figures = True
+        try:
+            # Determine which chart to create based on available data columns
+            if 'vendor' in self.data.columns or 'total_amount' in self.data.columns:
+                # Invoice data
+                fig, _ = self.create_invoice_summary_chart()
+                output_path = os.path.join(output_dir, f"{prefix}_invoice_summary.png")
+                _save_png(fig, output_path)
+                saved_files.append(output_path)
+                
+            # Check for metric columns
+            metric_columns = [col for col in self.data.columns if col.startswith('metric_')]
+            if metric_columns:
+                # Report data
+                fig, _ = self.create_report_summary_chart()
+                output_path = os.path.join(output_dir, f"{prefix}_report_summary.png")
+                _save_png(fig, output_path)
+                saved_files.append(output_path)
+                
+            # Create anomaly chart if insights contain anomalies
+            anomalies = self._anomaly_records()
+            if anomalies is not None:
+                fig, _ = self.create_anomaly_chart(anomalies)
+                output_path = os.path.join(output_dir, f"{prefix}_anomalies.png")
+                _save_png(fig, output_path)
+                saved_files.append(output_path)
+        finally:
+            self._reuse_figures = False
             
         return saved_files 
\ No newline at end of file
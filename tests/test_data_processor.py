@@ -0,0 +1,148 @@
+import os
+import sys
+import json
+import unittest
+import tempfile
+
+import pandas as pd
+
+# Add the src directory to the path
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.append(src_path)
+
+from data_processor import DataProcessor, DataAnalyzer
+
+
+class TestDataProcessor(unittest.TestCase):
+    """Test cases for the DataProcessor class"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.invoices = [
+            {"invoice_number": "INV-1", "date": "03/18/2023", "vendor": "ACME Corp",
+             "total_amount": 4708.0, "line_items": []},
+            {"invoice_number": "INV-2", "date": "04/02/2023", "vendor": "Global Logistics Ltd.",
+             "total_amount": 1250.0, "line_items": []},
+            {"invoice_number": "INV-3", "date": "not a date", "vendor": "ACME Corp",
+             "total_amount": 300.0, "line_items": []}
+        ]
+
+    def test_process_invoice_dates(self):
+        """Test dates are parsed with one guessed format and bad values become NaT"""
+        processor = DataProcessor(self.invoices)
+        df = processor.process_invoice_data()
+
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(df['date']))
+        self.assertEqual(df.loc["INV-1", "date"], pd.Timestamp(2023, 3, 18))
+        self.assertEqual(df.loc["INV-2", "date"], pd.Timestamp(2023, 4, 2))
+        self.assertTrue(pd.isna(df.loc["INV-3", "date"]))
+        self.assertEqual(list(df.columns), ["date", "vendor", "total_amount", "line_item_count"])
+
+    def test_save_round_trip(self):
+        """Test the processed invoices survive being written to CSV and Excel and read back"""
+        processor = DataProcessor(self.invoices)
+        processor.process_invoice_data()
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = os.path.join(tmp, "processed.csv")
+            excel_path = os.path.join(tmp, "processed.xlsx")
+            processor.save_to_csv(csv_path)
+            processor.save_to_excel(excel_path)
+
+            from_csv = pd.read_csv(csv_path, index_col=0, parse_dates=["date"])
+            from_excel = pd.read_excel(excel_path, index_col=0)
+
+        for df in (from_csv, from_excel):
+            self.assertEqual(list(df.index), ["INV-1", "INV-2", "INV-3"])
+            self.assertEqual(list(df.columns), ["date", "vendor", "total_amount", "line_item_count"])
+            self.assertEqual(df.loc["INV-2", "date"], pd.Timestamp(2023, 4, 2))
+            self.assertTrue(pd.isna(df.loc["INV-3", "date"]))
+            self.assertEqual(df["vendor"].tolist(), ["ACME Corp", "Global Logistics Ltd.", "ACME Corp"])
+            self.assertEqual(df["total_amount"].tolist(), [4708.0, 1250.0, 300.0])
+
+    def test_save_to_csv_text(self):
+        """Test the CSV text is exactly what pandas writes, whether or not pyarrow backs the text columns"""
+        processor = DataProcessor(self.invoices)
+        processor.process_invoice_data()
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = os.path.join(tmp, "processed.csv")
+            processor.save_to_csv(csv_path)
+            with open(csv_path) as f:
+                text = f.read()
+
+        self.assertEqual(text, "invoice_number,date,vendor,total_amount,line_item_count\n"
+                               "INV-1,2023-03-18,ACME Corp,4708.0,0\n"
+                               "INV-2,2023-04-02,Global Logistics Ltd.,1250.0,0\n"
+                               "INV-3,,ACME Corp,300.0,0\n")
+
+    def test_export_columnar_json(self):
+        """Test the columnar export keeps flat fields in the table and nested ones in the .jsonl file"""
+        processor = DataProcessor(self.invoices)
+        with tempfile.TemporaryDirectory() as tmp:
+            output_path = os.path.join(tmp, "raw.json")
+            processor.export_as_json(output_path, format='columnar')
+
+            with open(output_path) as f:
+                table = json.load(f)
+            with open(os.path.join(tmp, "raw.jsonl")) as f:
+                nested = [json.loads(line) for line in f]
+
+        self.assertEqual(table["columns"], ["invoice_number", "date", "vendor", "total_amount"])
+        self.assertEqual(table["data"][0], ["INV-1", "03/18/2023", "ACME Corp", 4708.0])
+        self.assertEqual(nested, [{"line_items": []}] * 3)
+
+    def test_stream_keeps_summary_only(self):
+        """Test streamed records go to the JSON Lines file while counts still reach the DataFrame"""
+        processor = DataProcessor()
+        with tempfile.TemporaryDirectory() as tmp:
+            output_path = os.path.join(tmp, "raw.jsonl")
+            processor.stream_to(output_path)
+            for invoice in self.invoices:
+                processor.add_data(dict(invoice, line_items=[{"Amount": "$1.00"}]))
+            processor.close_stream()
+
+            with open(output_path) as f:
+                streamed = [json.loads(line) for line in f]
+
+        self.assertEqual(streamed[0]["line_items"], [{"Amount": "$1.00"}])
+        self.assertNotIn("line_items", processor.data_list[0])
+        df = processor.process_invoice_data()
+        self.assertEqual(df['line_item_count'].tolist(), [1, 1, 1])
+
+    def test_process_report_dates(self):
+        """Test report dates go through the same parsing"""
+        processor = DataProcessor([{"title": "Report", "date": "03/18/2023", "key_metrics": {}}])
+        df = processor.process_report_data()
+
+        self.assertEqual(df.loc[0, "date"], pd.Timestamp(2023, 3, 18))
+
+
+class TestDataAnalyzer(unittest.TestCase):
+    """Test cases for the DataAnalyzer class"""
+
+    def test_top_vendors_ties(self):
+        """Test tied vendors are ranked by name, whatever order the invoices arrive in"""
+        df = pd.DataFrame({'vendor': ['Zeta', 'Beta', 'Alpha', 'Gamma', 'Gamma'],
+                           'total_amount': [100.0, 100.0, 100.0, 50.0, 50.0]})
+        for data in (df, df.iloc[::-1]):
+            insights = DataAnalyzer(data).analyze_invoices()
+            self.assertEqual(list(insights['top_vendors']), ['Gamma', 'Alpha', 'Beta'])
+            self.assertEqual(list(insights['top_vendors_by_spend']), ['Alpha', 'Beta', 'Gamma'])
+
+    def test_get_anomalies(self):
+        """Test only values beyond the z-score threshold are reported"""
+        df = pd.DataFrame({'total_amount': [100.0] * 9 + [1000.0],
+                           'constant': [1.0] * 10,
+                           'vendor': ['ACME Corp'] * 10},
+                          index=[f"INV-{i}" for i in range(10)])
+        anomalies = DataAnalyzer(df).get_anomalies()
+
+        self.assertEqual(len(anomalies), 1)
+        self.assertEqual(anomalies[0]['index'], "INV-9")
+        self.assertEqual(anomalies[0]['column'], 'total_amount')
+        self.assertEqual(anomalies[0]['value'], 1000.0)
+        self.assertAlmostEqual(anomalies[0]['mean'], 190.0)
+        self.assertGreater(anomalies[0]['z_score'], 2.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
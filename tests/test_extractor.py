@@ -14,19 +14,24 @@ from pdf_extractor import PDFExtractor
 class TestPDFExtractor(unittest.TestCase):
     """Test cases for the PDFExtractor class"""
     
-    def setUp(self):
+    # A minimal one-page PDF, written once for the whole class since no test modifies it
+    PDF_BYTES = b"%PDF-1.7\n%\xe2\xe3\xcf\xd3\n1 0 obj\n<</Type/Catalog/Pages 2 0 R>>\nendobj\n2 0 obj\n<</Type/Pages/Kids[3 0 R]/Count 1>>\nendobj\n3 0 obj\n<</Type/Page/MediaBox[0 0 612 792]/Parent 2 0 R/Resources<<>>>>\nendobj\nxref\n0 4\n0000000000 65535 f \n0000000015 00000 n \n0000000060 00000 n \n0000000111 00000 n \n\ntrailer\n<</Size 4/Root 1 0 R>>\n%%EOF"
+    
+    @classmethod
+    def setUpClass(cls):
         """Set up test environment"""
         # Create a temporary PDF file for testing
-        self.test_dir = tempfile.TemporaryDirectory()
-        self.temp_pdf_path = os.path.join(self.test_dir.name, "test.pdf")
+        cls.test_dir = tempfile.TemporaryDirectory()
+        cls.temp_pdf_path = os.path.join(cls.test_dir.name, "test.pdf")
         
         # Create an empty PDF file
-        with open(self.temp_pdf_path, "wb") as f:
-            f.write(b"%PDF-1.7\n%\xe2\xe3\xcf\xd3\n1 0 obj\n<</Type/Catalog/Pages 2 0 R>>\nendobj\n2 0 obj\n<</Type/Pages/Kids[3 0 R]/Count 1>>\nendobj\n3 0 obj\n<</Type/Page/MediaBox[0 0 612 792]/Parent 2 0 R/Resources<<>>>>\nendobj\nxref\n0 4\n0000000000 65535 f \n0000000015 00000 n \n0000000060 00000 n \n0000000111 00000 n \n\ntrailer\n<</Size 4/Root 1 0 R>>\n%%EOF")
+        with open(cls.temp_pdf_path, "wb") as f:
+            f.write(cls.PDF_BYTES)
         
-    def tearDown(self):
+    @classmethod
+    def tearDownClass(cls):
         """Clean up test environment"""
-        self.test_dir.cleanup()
+        cls.test_dir.cleanup()
         
     def test_init(self):
         """Test initializing the PDFExtractor"""
@@ -0,0 +1,125 @@
+import os
+import sys
+import unittest
+import tempfile
+
+import pandas as pd
+
+# Add the src directory to the path
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.append(src_path)
+
+import main
+from main import _extract_cached
+
+
+class FakeExtractor:
+    """Stand-in extractor that records how often it runs"""
+
+    calls = 0
+
+    def __init__(self, pdf_path):
+        self.pdf_path = pdf_path
+
+    def extract(self):
+        FakeExtractor.calls += 1
+        return {"title": "Report", "key_metrics": {"Revenue": 10.0},
+                "tables": [pd.DataFrame([["a", None]], columns=["Item", "Price"])]}
+
+
+class TestExtractCache(unittest.TestCase):
+    """Test cases for the on-disk extraction cache"""
+
+    def setUp(self):
+        """Set up a PDF file and an empty cache directory"""
+        self.test_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.test_dir.name, "cache")
+        self.pdf_path = os.path.join(self.test_dir.name, "test.pdf")
+        with open(self.pdf_path, "wb") as f:
+            f.write(b"%PDF-1.7\n%%EOF")
+        FakeExtractor.calls = 0
+
+    def tearDown(self):
+        """Clean up test environment"""
+        self.test_dir.cleanup()
+
+    def extract(self):
+        return _extract_cached(self.pdf_path, FakeExtractor, 'extract', self.cache_dir)
+
+    def test_miss_then_hit(self):
+        """Test a second extraction of the same file is served from the cache, tables included"""
+        first = self.extract()
+        second = self.extract()
+
+        self.assertEqual(FakeExtractor.calls, 1)
+        self.assertEqual(second["key_metrics"], first["key_metrics"])
+        self.assertTrue(second["tables"][0].equals(first["tables"][0]))
+        self.assertTrue(all(name.endswith(".json") for name in os.listdir(self.cache_dir)))
+
+    def test_changed_file_misses(self):
+        """Test different file contents are extracted again"""
+        self.extract()
+        with open(self.pdf_path, "ab") as f:
+            f.write(b"\n")
+        self.extract()
+
+        self.assertEqual(FakeExtractor.calls, 2)
+
+    def test_extractor_version_change_misses(self):
+        """Test results cached by a different version of the extraction code are not reused"""
+        self.extract()
+        version = main._EXTRACTOR_VERSION
+        main._EXTRACTOR_VERSION = "changed"
+        try:
+            self.extract()
+        finally:
+            main._EXTRACTOR_VERSION = version
+
+        self.assertEqual(FakeExtractor.calls, 2)
+
+    def test_acroform_bypasses_cache(self):
+        """Test files with form fields are always extracted and never cached"""
+        with open(self.pdf_path, "wb") as f:
+            f.write(b"%PDF-1.7\n<</AcroForm 4 0 R>>\n%%EOF")
+        self.extract()
+        self.extract()
+
+        self.assertEqual(FakeExtractor.calls, 2)
+        self.assertFalse(os.path.exists(self.cache_dir))
+
+    def test_corrupt_cache_file_recovers(self):
+        """Test an unreadable cache entry is replaced by a fresh extraction"""
+        self.extract()
+        for name in os.listdir(self.cache_dir):
+            with open(os.path.join(self.cache_dir, name), "w") as f:
+                f.write("{not json")
+        data = self.extract()
+        self.extract()
+
+        self.assertEqual(FakeExtractor.calls, 2)
+        self.assertEqual(data["title"], "Report")
+
+    def test_unwritable_cache_keeps_result(self):
+        """Test a cache directory that cannot be created still returns the extracted data"""
+        with open(self.cache_dir, "w") as f:
+            f.write("not a directory")
+        data = self.extract()
+
+        self.assertEqual(data["title"], "Report")
+        self.assertEqual(sorted(os.listdir(self.test_dir.name)), ["cache", "test.pdf"])
+
+    def test_unserializable_result_is_not_cached(self):
+        """Test a result JSON cannot store is returned and leaves no temporary file behind"""
+        class SetExtractor(FakeExtractor):
+            def extract(self):
+                FakeExtractor.calls += 1
+                return {"title": "Report", "tags": {"a", "b"}}
+
+        data = _extract_cached(self.pdf_path, SetExtractor, 'extract', self.cache_dir)
+
+        self.assertEqual(data["tags"], {"a", "b"})
+        self.assertEqual(os.listdir(self.cache_dir), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import os
+import sys
+import unittest
+import tempfile
+
+import matplotlib.pyplot as plt
+import pandas as pd
+
+# Add the src directory to the path
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.append(src_path)
+
+from visualizer import DataVisualizer
+
+
+class TestDataVisualizer(unittest.TestCase):
+    """Test cases for the DataVisualizer class"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.data = pd.DataFrame({'date': pd.to_datetime(['2023-01-05', '2023-02-10', '2023-02-20']),
+                                  'vendor': ['ACME Corp', 'Globex', 'ACME Corp'],
+                                  'total_amount': [100.0, 250.0, 900.0]},
+                                 index=['INV-1', 'INV-2', 'INV-3'])
+        self.anomalies = [{'index': 'INV-3', 'column': 'total_amount', 'value': 900.0,
+                           'mean': 416.67, 'std': 424.26}]
+
+    def test_create_chart_returns_new_figure(self):
+        """Test each public chart call returns its own figure and leaves earlier ones untouched"""
+        visualizer = DataVisualizer(self.data)
+        first, first_axs = visualizer.create_anomaly_chart(self.anomalies)
+        second, _ = visualizer.create_anomaly_chart([])
+
+        self.assertIsNot(first, second)
+        self.assertEqual(first_axs[0].get_title(), 'Anomalies in total_amount')
+
+        other = DataVisualizer(self.data.iloc[:2])
+        self.assertIsNot(visualizer.create_invoice_summary_chart()[0], other.create_invoice_summary_chart()[0])
+        plt.close('all')
+
+    def test_create_chart_figure_is_managed_by_pyplot(self):
+        """Test public chart calls return figures pyplot can show and close"""
+        fig, _ = DataVisualizer(self.data).create_invoice_summary_chart()
+
+        self.assertTrue(plt.fignum_exists(fig.number))
+        plt.close(fig)
+        self.assertFalse(plt.fignum_exists(fig.number))
+
+    def test_anomaly_chart_with_repeated_index(self):
+        """Test anomalies are plotted at the first matching row when index labels repeat"""
+        data = self.data.rename(index={'INV-2': 'INV-3'})
+        fig, axs = DataVisualizer(data).create_anomaly_chart(self.anomalies)
+
+        offsets = axs[0].collections[0].get_offsets()
+        self.assertEqual(offsets.tolist(), [[1.0, 900.0]])
+        plt.close(fig)
+
+    def test_save_visualizations_repeatable(self):
+        """Test saving twice from one visualizer writes the same images"""
+        visualizer = DataVisualizer(self.data, {'anomalies': self.anomalies})
+        with tempfile.TemporaryDirectory() as tmp:
+            first = visualizer.save_visualizations(os.path.join(tmp, 'a'))
+            second = visualizer.save_visualizations(os.path.join(tmp, 'b'))
+            self.assertEqual([os.path.basename(path) for path in first],
+                             ['chart_invoice_summary.png', 'chart_anomalies.png'])
+            for path_a, path_b in zip(first, second):
+                with open(path_a, 'rb') as fa, open(path_b, 'rb') as fb:
+                    self.assertEqual(fa.read(), fb.read())
+
+    def test_save_picks_up_later_anomalies(self):
+        """Test anomalies added to the insights after construction are still charted"""
+        visualizer = DataVisualizer(self.data)
+        visualizer.insights['anomalies'] = self.anomalies
+        with tempfile.TemporaryDirectory() as tmp:
+            saved = visualizer.save_visualizations(tmp)
+
+        self.assertEqual([os.path.basename(path) for path in saved],
+                         ['chart_invoice_summary.png', 'chart_anomalies.png'])
+
+
+if __name__ == '__main__':
+    unittest.main()